@@ -64,7 +64,7 @@ async def simulate_llm_requests():
             await asyncio.sleep(0.5 + i * 0.1)  # Variable processing time
             
             # Set completion tokens
-            tracker.set_completion_tokens(50 + i * 10)
+            tracker.completion_tokens = 50 + i * 10
     
     # Simulate a failed request
     try:
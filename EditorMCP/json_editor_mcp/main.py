@@ -1,15 +1,33 @@
 """Main entry point for the JSON Editor MCP server."""
 
 import asyncio
+import json
 import logging
 import sys
 from typing import Optional
 
 import structlog
 
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    _HAS_ORJSON = False
+
 from .server import main as server_main
 
 
+def _render_json(event_dict, **kwargs) -> str:
+    """Serialize a structlog event dict, using orjson when available."""
+    if _HAS_ORJSON:
+        try:
+            return orjson.dumps(event_dict, option=orjson.OPT_NON_STR_KEYS, **kwargs).decode("utf-8")
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(event_dict, **kwargs)
+
+
 def setup_logging(log_level: str = "INFO") -> None:
     """Set up structured logging."""
     logging.basicConfig(
@@ -28,7 +46,7 @@ def setup_logging(log_level: str = "INFO") -> None:
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
             structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer()
+            structlog.processors.JSONRenderer(serializer=_render_json)
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
@@ -3,7 +3,7 @@
 import copy
 import hashlib
 import json
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..models.core import MapEntry
 from ..models.errors import ProcessingException
@@ -27,7 +27,9 @@ class JSONProcessor:
         """
         try:
             counter = 0
-            stack: List[Tuple[Any, List[str]]] = [(document, [])]
+            # Paths are linked (parent_link, key) pairs while traversing so each
+            # push is O(1); lists are only materialized for emitted entries
+            stack: List[Tuple[Any, Optional[Tuple[Any, str]]]] = [(document, None)]
             out: List[MapEntry] = []
             
             def _next_id() -> str:
@@ -36,25 +38,34 @@ class JSONProcessor:
                 counter += 1
                 return cid
             
+            def _materialize(link: Optional[Tuple[Any, str]]) -> List[str]:
+                parts: List[str] = []
+                while link is not None:
+                    link, key = link
+                    parts.append(key)
+                parts.reverse()
+                return parts
+            
             while stack:
-                node, path = stack.pop()
+                node, link = stack.pop()
                 
                 if isinstance(node, dict):
                     # Check if this is an editable text node
                     if node.get("type") in ["text", "Text", "Placeholder"] and "value" in node:
-                        out.append(MapEntry(
+                        # Inputs come from this traversal, so skip field validation
+                        out.append(MapEntry.model_construct(
                             id=_next_id(),
-                            path=path + ["value"],
+                            path=_materialize((link, "value")),
                             value=str(node["value"])
                         ))
                     else:
                         # Push children in reverse order for left->right traversal
                         for k in sorted(node.keys(), reverse=True):
-                            stack.append((node[k], path + [k]))
+                            stack.append((node[k], (link, k)))
                 elif isinstance(node, list):
                     # Process list items in reverse order for correct traversal
                     for idx, item in enumerate(reversed(node)):
-                        stack.append((item, path + [str(len(node) - 1 - idx)]))
+                        stack.append((item, (link, str(len(node) - 1 - idx))))
             
             return out
             
@@ -85,8 +85,9 @@ class PreviewTool:
         
         # Record request start for monitoring
         monitoring_manager = get_monitoring_manager()
+        request_token = None
         if monitoring_manager:
-            monitoring_manager.record_request_start("preview", request_id)
+            request_token = monitoring_manager.record_request_start("preview", request_id)
         
         try:
             # Log request details for debugging
@@ -144,7 +145,7 @@ class PreviewTool:
             
             # Record successful completion
             if monitoring_manager:
-                monitoring_manager.record_request_complete("preview", request_id, "success")
+                monitoring_manager.record_request_complete("preview", request_token, "success")
                 monitoring_manager.record_document_processing(
                     "preview", len(str(request.document)), duration, len(proposed_changes)
                 )
@@ -158,7 +159,7 @@ class PreviewTool:
             # Record error completion
             if monitoring_manager:
                 monitoring_manager.record_request_complete(
-                    "preview", request_id, "error", error_response.error_type
+                    "preview", request_token, "error", error_response.error_type
                 )
             
             log_error_with_context(
@@ -176,7 +177,7 @@ class PreviewTool:
             # Record error completion
             if monitoring_manager:
                 monitoring_manager.record_request_complete(
-                    "preview", request_id, "error", "unexpected_error"
+                    "preview", request_token, "error", "unexpected_error"
                 )
             
             log_error_with_context(
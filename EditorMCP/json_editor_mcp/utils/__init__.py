@@ -13,7 +13,7 @@ from .metrics import (
     get_performance_monitor, timer, setup_default_alerts
 )
 from .llm_monitoring import (
-    LLMPerformanceMonitor, LLMRequestTracker, get_llm_monitor, track_llm_request
+    LLMPerformanceMonitor, get_llm_monitor, track_llm_request
 )
 from .monitoring_config import (
     MonitoringManager, setup_monitoring, get_monitoring_manager
@@ -50,7 +50,6 @@ __all__ = [
     "timer",
     "setup_default_alerts",
     "LLMPerformanceMonitor",
-    "LLMRequestTracker", 
     "get_llm_monitor",
     "track_llm_request",
     "MonitoringManager",
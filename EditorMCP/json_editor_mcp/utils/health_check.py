@@ -2,15 +2,24 @@
 
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 
+from .logging_config import _iso_now
 from .monitoring_config import get_monitoring_manager
 from .metrics import get_metrics_collector, get_performance_monitor
 from .llm_monitoring import get_llm_monitor
 from ..config.models import ServerConfig
 
+try:
+    import psutil
+    _HAS_PSUTIL = True
+except ImportError:
+    psutil = None
+    _HAS_PSUTIL = False
+
 
 @dataclass
 class HealthCheckResult:
@@ -25,14 +34,71 @@ class HealthCheckResult:
 class HealthChecker:
     """Comprehensive health checker for all system components."""
     
-    def __init__(self, config: ServerConfig):
+    def __init__(
+        self,
+        config: ServerConfig,
+        timeout_seconds: float = 5.0,
+        readiness_ttl_seconds: float = 30.0
+    ):
         """Initialize health checker.
         
         Args:
             config: Server configuration
+            timeout_seconds: Wall-clock budget for a full health check; checks
+                still running when it expires are reported as unhealthy
+            readiness_ttl_seconds: How long component statuses from the last
+                check remain valid for readiness probes
         """
         self.config = config
+        self.timeout_seconds = timeout_seconds
+        self.readiness_ttl_seconds = readiness_ttl_seconds
+        
+        # (monotonic time, {component: {"status", "message"}}) from the most
+        # recent check; readiness probes read this instead of re-probing
+        self._last_full_check: Optional[Tuple[float, Dict[str, Dict[str, str]]]] = None
         self.logger = logging.getLogger(__name__)
+        
+        # Logger used to probe the logging system; it never emits output
+        self._test_logger = logging.getLogger("health_check_test")
+        self._test_logger.propagate = False
+        if not self._test_logger.handlers:
+            self._test_logger.addHandler(logging.NullHandler())
+        self._expected_log_level = getattr(logging, self.config.log_level.upper())
+        
+        # Prime psutil's CPU counter so later non-blocking reads return the
+        # usage since the previous call instead of 0.0
+        if _HAS_PSUTIL:
+            psutil.cpu_percent(interval=None)
+        
+        # ServerConfig is not mutated at runtime, so the configuration check
+        # is evaluated once and served from cache afterwards
+        self._config_check_result = self._evaluate_configuration()
+        
+        # List of health checks performed by check_all_components
+        self._health_checks = [
+            self._check_metrics_collector,
+            self._check_performance_monitor,
+            self._check_llm_monitor,
+            self._check_monitoring_manager,
+            self._check_logging_system,
+            self._check_configuration,
+            self._check_system_resources
+        ]
+        
+        # Long-lived pool with one worker per check; replaced after a run
+        # whose timed-out checks are still occupying workers
+        self._executor = self._new_executor()
+    
+    def _new_executor(self) -> ThreadPoolExecutor:
+        """Create the executor used to run health checks concurrently."""
+        return ThreadPoolExecutor(
+            max_workers=len(self._health_checks),
+            thread_name_prefix="health"
+        )
+    
+    def close(self) -> None:
+        """Shut down the health check executor."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
     
     def check_all_components(self) -> Dict[str, Any]:
         """Perform comprehensive health check of all components.
@@ -43,7 +109,7 @@ class HealthChecker:
         start_time = time.time()
         
         health_report = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _iso_now(),
             "overall_status": "healthy",
             "components": {},
             "summary": {
@@ -55,21 +121,33 @@ class HealthChecker:
             "response_time_ms": 0.0
         }
         
-        # List of health checks to perform
-        health_checks = [
-            self._check_metrics_collector,
-            self._check_performance_monitor,
-            self._check_llm_monitor,
-            self._check_monitoring_manager,
-            self._check_logging_system,
-            self._check_configuration,
-            self._check_system_resources
+        # Run all health checks concurrently, collecting results in order
+        futures = [
+            (check_func, self._executor.submit(check_func))
+            for check_func in self._health_checks
         ]
+        _, not_done = wait([future for _, future in futures], timeout=self.timeout_seconds)
         
-        # Perform all health checks
-        for check_func in health_checks:
+        # Queued checks are cancelled; checks already running cannot be, so
+        # hand their workers to the old pool and start the next run on a
+        # fresh one instead of queueing behind a hung probe
+        if not all([future.cancel() for future in not_done]):
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+        
+        for check_func, future in futures:
             try:
-                result = check_func()
+                if future in not_done:
+                    # Don't wait on a stuck probe
+                    result = HealthCheckResult(
+                        component=check_func.__name__[len("_check_"):],
+                        status="unhealthy",
+                        message="Health check timed out",
+                        details={"timeout_seconds": self.timeout_seconds},
+                        response_time_ms=self.timeout_seconds * 1000
+                    )
+                else:
+                    result = future.result()
                 health_report["components"][result.component] = {
                     "status": result.status,
                     "message": result.message,
@@ -107,43 +185,60 @@ class HealthChecker:
         # Calculate total response time
         health_report["response_time_ms"] = (time.time() - start_time) * 1000
         
+        self._last_full_check = (time.monotonic(), {
+            component: {"status": result["status"], "message": result["message"]}
+            for component, result in health_report["components"].items()
+        })
+        
         return health_report
     
     def check_readiness(self) -> Dict[str, Any]:
         """Check if the system is ready to serve requests.
         
+        Readiness is derived from the component statuses cached by the last
+        check; the critical checks are only run when that cache is missing
+        or older than readiness_ttl_seconds.
+        
         Returns:
             Dictionary containing readiness status
         """
         readiness = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _iso_now(),
             "ready": True,
             "checks": {}
         }
         
         # Critical components that must be healthy for readiness
         critical_checks = [
-            ("configuration", self._check_configuration),
-            ("logging", self._check_logging_system),
-            ("metrics", self._check_metrics_collector)
+            ("configuration", "configuration", self._check_configuration),
+            ("logging", "logging_system", self._check_logging_system),
+            ("metrics", "metrics_collector", self._check_metrics_collector)
         ]
         
-        for check_name, check_func in critical_checks:
-            try:
-                result = check_func()
-                readiness["checks"][check_name] = {
-                    "status": result.status,
-                    "message": result.message
-                }
-                
-                if result.status == "unhealthy":
-                    readiness["ready"] = False
-                    
-            except Exception as e:
-                readiness["checks"][check_name] = {
-                    "status": "unhealthy",
-                    "message": f"Check failed: {str(e)}"
-                }
+        cached = self._last_full_check
+        if cached is None or time.monotonic() - cached[0] > self.readiness_ttl_seconds:
+            statuses = {}
+            for _, component, check_func in critical_checks:
+                try:
+                    result = check_func()
+                    statuses[component] = {"status": result.status, "message": result.message}
+                except Exception as e:
+                    statuses[component] = {
+                        "status": "unhealthy",
+                        "message": f"Check failed: {str(e)}"
+                    }
+            self._last_full_check = (time.monotonic(), statuses)
+        else:
+            statuses = cached[1]
+        
+        for check_name, component, _ in critical_checks:
+            check = statuses.get(component, {
+                "status": "unhealthy",
+                "message": "No health data available"
+            })
+            readiness["checks"][check_name] = dict(check)
+            
+            if check["status"] == "unhealthy":
                 readiness["ready"] = False
         
         return readiness
@@ -155,7 +250,7 @@ class HealthChecker:
             Dictionary containing liveness status
         """
         return {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _iso_now(),
             "alive": True,
             "uptime_seconds": time.time() - getattr(self, '_start_time', time.time()),
             "message": "System is alive and responsive"
@@ -207,8 +302,10 @@ class HealthChecker:
         try:
             performance_monitor = get_performance_monitor()
             
-            # Get performance report
-            report = performance_monitor.get_performance_report()
+            # Get performance report; only counts are read from it, so the
+            # reusable report tree avoids rebuilding its metric dicts on
+            # every check
+            report = performance_monitor.get_performance_report(reuse=True)
             
             if report:
                 alerts_count = len(report.get("alerts", []))
@@ -329,16 +426,12 @@ class HealthChecker:
         start_time = time.time()
         
         try:
-            # Test logging functionality
-            test_logger = logging.getLogger("health_check_test")
-            test_logger.info("Health check test log message")
-            
             # Check log level configuration
             root_logger = logging.getLogger()
             current_level = root_logger.getEffectiveLevel()
-            expected_level = getattr(logging, self.config.log_level.upper())
+            expected_level = self._expected_log_level
             
-            if current_level == expected_level:
+            if current_level == expected_level and self._test_logger.isEnabledFor(expected_level):
                 status = "healthy"
                 message = f"Logging system configured correctly at {self.config.log_level} level"
                 details = {
@@ -370,7 +463,11 @@ class HealthChecker:
         )
     
     def _check_configuration(self) -> HealthCheckResult:
-        """Check configuration health."""
+        """Check configuration health (cached, see _evaluate_configuration)."""
+        return self._config_check_result
+    
+    def _evaluate_configuration(self) -> HealthCheckResult:
+        """Validate the server configuration."""
         start_time = time.time()
         
         try:
@@ -425,11 +522,18 @@ class HealthChecker:
         """Check system resource usage."""
         start_time = time.time()
         
+        if not _HAS_PSUTIL:
+            return HealthCheckResult(
+                component="system_resources",
+                status="degraded",
+                message="System resource monitoring not available (psutil not installed)",
+                details={"psutil_available": False},
+                response_time_ms=(time.time() - start_time) * 1000
+            )
+        
         try:
-            import psutil
-            
-            # Get system metrics
-            cpu_percent = psutil.cpu_percent(interval=0.1)
+            # Get system metrics (non-blocking: usage since the previous call)
+            cpu_percent = psutil.cpu_percent(interval=None)
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
             
@@ -460,12 +564,6 @@ class HealthChecker:
                 "disk_free_gb": disk.free / (1024**3)
             }
             
-        except ImportError:
-            # psutil not available
-            status = "degraded"
-            message = "System resource monitoring not available (psutil not installed)"
-            details = {"psutil_available": False}
-            
         except Exception as e:
             status = "unhealthy"
             message = f"System resource check error: {str(e)}"
@@ -3,7 +3,7 @@
 import copy
 import hashlib
 import json
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from ..models.core import MapEntry, ProposedChange
 
@@ -49,7 +49,9 @@ class JSONProcessor:
                 raise InvalidJSONError("Document must be a dictionary")
             
             counter = 0
-            stack: List[Tuple[Any, List[str]]] = [(document, [])]
+            # Paths are linked (parent_link, key) pairs while traversing so each
+            # push is O(1); lists are only materialized for emitted entries
+            stack: List[Tuple[Any, Optional[Tuple[Any, str]]]] = [(document, None)]
             out: List[MapEntry] = []
             
             def _next_id() -> str:
@@ -58,16 +60,25 @@ class JSONProcessor:
                 counter += 1
                 return cid
             
+            def _materialize(link: Optional[Tuple[Any, str]]) -> List[str]:
+                parts: List[str] = []
+                while link is not None:
+                    link, key = link
+                    parts.append(key)
+                parts.reverse()
+                return parts
+            
             while stack:
-                node, path = stack.pop()
+                node, link = stack.pop()
                 
                 if isinstance(node, dict):
                     # Check if this is a text node that should be editable
                     if node.get("type") in ["text", "Text", "Placeholder"] and "value" in node:
                         try:
-                            map_entry = MapEntry(
+                            # Inputs come from this traversal, so skip field validation
+                            map_entry = MapEntry.model_construct(
                                 id=_next_id(),
-                                path=path + ["value"],
+                                path=_materialize((link, "value")),
                                 value=str(node["value"])
                             )
                             out.append(map_entry)
@@ -76,11 +87,11 @@ class JSONProcessor:
                     else:
                         # Push children in reverse order for left->right traversal
                         for k in sorted(node.keys(), reverse=True):
-                            stack.append((node[k], path + [k]))
+                            stack.append((node[k], (link, k)))
                 elif isinstance(node, list):
                     # Process list items in reverse order
                     for idx, item in enumerate(reversed(node)):
-                        stack.append((item, path + [str(len(node) - 1 - idx)]))
+                        stack.append((item, (link, str(len(node) - 1 - idx))))
             
             return out
             
@@ -106,6 +117,7 @@ class JSONProcessor:
             InvalidJSONError: If original document is invalid
             MapConversionError: If reconstruction fails
         """
+        current_entry = None
         try:
             if not isinstance(original, dict):
                 raise InvalidJSONError("Original document must be a dictionary")
@@ -113,20 +125,20 @@ class JSONProcessor:
             # Deep clone the original document
             doc = copy.deepcopy(original)
             
-            # Apply each updated entry
-            for entry in updated_map:
-                try:
-                    self._apply_map_entry(doc, entry)
-                except Exception as e:
-                    raise MapConversionError(f"Failed to apply map entry {entry.id}: {e}")
+            # Apply each updated entry; failures are attributed to current_entry
+            # by the handler below instead of guarding every iteration
+            for current_entry in updated_map:
+                self._apply_map_entry(doc, current_entry)
             
             return doc
             
         except InvalidJSONError:
             raise
-        except MapConversionError:
-            raise
         except Exception as e:
+            if current_entry is not None:
+                raise MapConversionError(f"Failed to apply map entry {current_entry.id}: {e}")
+            if isinstance(e, MapConversionError):
+                raise
             raise MapConversionError(f"Unexpected error during map to JSON conversion: {e}")
     
     def _apply_map_entry(self, doc: Dict[str, Any], entry: MapEntry) -> None:
@@ -220,20 +232,40 @@ class JSONProcessor:
             raise InvalidJSONError("Document must be a JSON object (dictionary)")
         
         try:
-            # Try to serialize and deserialize to ensure it's valid JSON
-            json_str = json.dumps(document)
-            json.loads(json_str)
+            # A successful serialization proves the in-memory object is valid JSON;
+            # parsing the result back would only duplicate the work
+            json.dumps(document)
             return document
         except (TypeError, ValueError) as e:
             raise InvalidJSONError(f"Document is not valid JSON: {e}")
     
-    def create_change_preview(self, original_map: List[MapEntry], updated_map: List[MapEntry]) -> List[ProposedChange]:
+    def build_lookup(self, entries: List[MapEntry]) -> Dict[str, MapEntry]:
+        """
+        Build an id -> entry lookup for a list of map entries.
+        
+        Args:
+            entries: Map entries to index
+            
+        Returns:
+            Dictionary mapping entry IDs to entries
+        """
+        return {entry.id: entry for entry in entries}
+    
+    def create_change_preview(
+        self,
+        original_map: List[MapEntry],
+        updated_map: List[MapEntry],
+        original_lookup: Optional[Dict[str, MapEntry]] = None
+    ) -> List[ProposedChange]:
         """
         Create a preview of changes between original and updated map entries.
         
         Args:
             original_map: Original map entries
             updated_map: Updated map entries
+            original_lookup: Optional pre-built lookup for original_map (see
+                build_lookup); pass it when diffing several updates against
+                the same baseline to avoid rebuilding it on every call
             
         Returns:
             List of proposed changes
@@ -245,23 +277,32 @@ class JSONProcessor:
             changes = []
             
             # Create lookup dictionaries for efficient comparison
-            original_lookup = {entry.id: entry for entry in original_map}
-            updated_lookup = {entry.id: entry for entry in updated_map}
+            if original_lookup is None:
+                original_lookup = self.build_lookup(original_map)
+            updated_lookup = self.build_lookup(updated_map)
+            
+            # Find changed ids with a set difference over (id, value) pairs; the
+            # set machinery compares cached value hashes first and only falls
+            # back to a full string comparison on a hash match
+            original_pairs = {(entry_id, entry.value) for entry_id, entry in original_lookup.items()}
+            changed_ids = {
+                entry_id for entry_id, value in
+                {(entry_id, entry.value) for entry_id, entry in updated_lookup.items()} - original_pairs
+            }
             
-            # Find changes
-            for entry_id, updated_entry in updated_lookup.items():
-                if entry_id in original_lookup:
-                    original_entry = original_lookup[entry_id]
-                    if original_entry.value != updated_entry.value:
-                        # Value changed
-                        change = ProposedChange(
-                            id=entry_id,
-                            path=updated_entry.path,
-                            current_value=original_entry.value,
-                            proposed_value=updated_entry.value,
-                            confidence=1.0
-                        )
-                        changes.append(change)
+            for entry_id in changed_ids:
+                updated_entry = updated_lookup[entry_id]
+                original_entry = original_lookup.get(entry_id)
+                if original_entry is not None:
+                    # Value changed
+                    change = ProposedChange(
+                        id=entry_id,
+                        path=updated_entry.path,
+                        current_value=original_entry.value,
+                        proposed_value=updated_entry.value,
+                        confidence=1.0
+                    )
+                    changes.append(change)
                 else:
                     # New entry (shouldn't happen in normal flow, but handle gracefully)
                     change = ProposedChange(
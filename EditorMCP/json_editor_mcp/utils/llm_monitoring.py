@@ -1,15 +1,22 @@
 """LLM provider performance monitoring and tracking."""
 
+import math
+import re
 import time
 import logging
+import threading
+from contextlib import contextmanager
+from array import array
+from bisect import bisect_left
+from itertools import islice
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, NamedTuple
+from typing import Dict, Iterator, List, Optional, Any, NamedTuple, Set, Tuple
 from dataclasses import dataclass, field
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
 from enum import Enum
 
 from .metrics import MetricsCollector, get_metrics_collector
-
+from .logging_config import _iso_now
 
 class LLMRequestStatus(Enum):
     """Status of LLM requests."""
@@ -21,7 +28,21 @@ class LLMRequestStatus(Enum):
     INVALID_RESPONSE = "invalid_response"
 
 
-@dataclass
+# Dense index per status, used for per-status counters and compact storage
+_STATUSES = list(LLMRequestStatus)
+_STATUS_INDEX = {status: index for index, status in enumerate(_STATUSES)}
+
+
+# Error message patterns used to classify failed requests, checked in order
+_ERROR_PATTERNS = [
+    (re.compile(r"timeout", re.IGNORECASE), LLMRequestStatus.TIMEOUT),
+    (re.compile(r"rate limit|429", re.IGNORECASE), LLMRequestStatus.RATE_LIMITED),
+    (re.compile(r"auth|401|403", re.IGNORECASE), LLMRequestStatus.AUTHENTICATION_ERROR),
+    (re.compile(r"invalid|malformed", re.IGNORECASE), LLMRequestStatus.INVALID_RESPONSE),
+]
+
+
+@dataclass(slots=True)
 class LLMRequestMetrics:
     """Metrics for a single LLM request."""
     provider: str
@@ -37,9 +58,10 @@ class LLMRequestMetrics:
     error_message: Optional[str] = None
     retry_count: int = 0
     rate_limit_delay: Optional[float] = None
+    start_monotonic: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMProviderStats:
     """Aggregated statistics for an LLM provider."""
     provider: str
@@ -47,43 +69,211 @@ class LLMProviderStats:
     total_requests: int = 0
     successful_requests: int = 0
     failed_requests: int = 0
-    timeout_requests: int = 0
-    rate_limited_requests: int = 0
-    auth_error_requests: int = 0
-    invalid_response_requests: int = 0
+    status_counts: List[int] = field(default_factory=lambda: [0] * len(_STATUSES))
     total_duration: float = 0.0
     total_tokens: int = 0
     total_prompt_tokens: int = 0
     total_completion_tokens: int = 0
     total_retries: int = 0
-    avg_duration: float = 0.0
-    success_rate: float = 0.0
-    error_rate: float = 0.0
-    tokens_per_second: float = 0.0
     last_request_time: Optional[datetime] = None
-    recent_errors: List[str] = field(default_factory=list)
+    recent_errors: deque = field(default_factory=lambda: deque(maxlen=10))
+    current_alerts: List[str] = field(default_factory=list)
+    _last_request_time_iso: Optional[Tuple[datetime, str]] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def last_request_time_iso(self) -> Optional[str]:
+        """ISO form of last_request_time, reformatted only when it changes."""
+        if self.last_request_time is None:
+            return None
+        cached = self._last_request_time_iso
+        if cached is None or cached[0] != self.last_request_time:
+            cached = self._last_request_time_iso = (self.last_request_time, self.last_request_time.isoformat())
+        return cached[1]
+    
+    # Per-status counts, indexed by _STATUS_INDEX
+    
+    @property
+    def timeout_requests(self) -> int:
+        """Number of requests that timed out."""
+        return self.status_counts[_STATUS_INDEX[LLMRequestStatus.TIMEOUT]]
+    
+    @property
+    def rate_limited_requests(self) -> int:
+        """Number of rate limited requests."""
+        return self.status_counts[_STATUS_INDEX[LLMRequestStatus.RATE_LIMITED]]
+    
+    @property
+    def auth_error_requests(self) -> int:
+        """Number of requests that failed authentication."""
+        return self.status_counts[_STATUS_INDEX[LLMRequestStatus.AUTHENTICATION_ERROR]]
+    
+    @property
+    def invalid_response_requests(self) -> int:
+        """Number of requests with an invalid response."""
+        return self.status_counts[_STATUS_INDEX[LLMRequestStatus.INVALID_RESPONSE]]
+    
+    # Derived metrics are computed on read so completing a request only
+    # touches the raw counters
+    
+    @property
+    def success_rate(self) -> float:
+        """Fraction of requests that succeeded."""
+        return self.successful_requests / self.total_requests if self.total_requests else 0.0
+    
+    @property
+    def error_rate(self) -> float:
+        """Fraction of requests that failed."""
+        return self.failed_requests / self.total_requests if self.total_requests else 0.0
+    
+    @property
+    def avg_duration(self) -> float:
+        """Average request duration in seconds."""
+        return self.total_duration / self.total_requests if self.total_requests else 0.0
+    
+    @property
+    def tokens_per_second(self) -> float:
+        """Token throughput over the total request duration."""
+        return self.total_tokens / self.total_duration if self.total_duration > 0 else 0.0
+
+
+class _RequestHistoryRing:
+    """Fixed-capacity ring of completed requests stored column-wise.
+    
+    Each field lives in its own array so scans touch only the columns they
+    need; LLMRequestMetrics objects are rebuilt only for returned rows.
+    Missing token counts are stored as -1 and a missing rate limit delay as NaN.
+    """
+    
+    def __init__(self, capacity: int):
+        """Initialize an empty ring.
+        
+        Args:
+            capacity: Maximum number of requests kept; older ones are overwritten
+        """
+        self.capacity = capacity
+        self.head = 0  # Next physical slot to write
+        self.count = 0
+        
+        self.request_ids: List[Optional[str]] = [None] * capacity
+        self.error_messages: List[Optional[str]] = [None] * capacity
+        self.start_times = array('d', [0.0]) * capacity
+        self.end_times = array('d', [0.0]) * capacity
+        self.durations = array('d', [0.0]) * capacity
+        self.rate_limit_delays = array('d', [0.0]) * capacity
+        self.statuses = array('b', [0]) * capacity
+        self.prompt_tokens = array('q', [0]) * capacity
+        self.completion_tokens = array('q', [0]) * capacity
+        self.total_tokens = array('q', [0]) * capacity
+        self.retry_counts = array('l', [0]) * capacity
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def append(self, request_metrics: LLMRequestMetrics):
+        """Store a completed request, overwriting the oldest when full."""
+        i = self.head
+        self.request_ids[i] = request_metrics.request_id
+        self.error_messages[i] = request_metrics.error_message
+        self.start_times[i] = request_metrics.start_time.timestamp()
+        self.end_times[i] = request_metrics.end_time.timestamp() if request_metrics.end_time else math.nan
+        self.durations[i] = request_metrics.duration_seconds if request_metrics.duration_seconds is not None else math.nan
+        self.rate_limit_delays[i] = request_metrics.rate_limit_delay if request_metrics.rate_limit_delay is not None else math.nan
+        self.statuses[i] = _STATUS_INDEX[request_metrics.status] if request_metrics.status is not None else -1
+        self.prompt_tokens[i] = request_metrics.prompt_tokens if request_metrics.prompt_tokens is not None else -1
+        self.completion_tokens[i] = request_metrics.completion_tokens if request_metrics.completion_tokens is not None else -1
+        self.total_tokens[i] = request_metrics.total_tokens if request_metrics.total_tokens is not None else -1
+        self.retry_counts[i] = request_metrics.retry_count
+        
+        self.head = (i + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+    
+    def clear(self):
+        """Drop all stored requests."""
+        self.head = 0
+        self.count = 0
+        self.request_ids = [None] * self.capacity
+        self.error_messages = [None] * self.capacity
+    
+    def physical_index(self, index: int) -> int:
+        """Map a logical index (0 = oldest) to its slot in the column arrays."""
+        return (self.head - self.count + index) % self.capacity
+    
+    def row(self, slot: int, provider: str, model: str) -> LLMRequestMetrics:
+        """Rebuild the LLMRequestMetrics stored in a physical slot."""
+        end_time = self.end_times[slot]
+        duration = self.durations[slot]
+        delay = self.rate_limit_delays[slot]
+        status = self.statuses[slot]
+        prompt_tokens = self.prompt_tokens[slot]
+        completion_tokens = self.completion_tokens[slot]
+        total_tokens = self.total_tokens[slot]
+        
+        return LLMRequestMetrics(
+            provider=provider,
+            model=model,
+            request_id=self.request_ids[slot],
+            start_time=datetime.fromtimestamp(self.start_times[slot]),
+            end_time=None if math.isnan(end_time) else datetime.fromtimestamp(end_time),
+            duration_seconds=None if math.isnan(duration) else duration,
+            status=None if status < 0 else _STATUSES[status],
+            prompt_tokens=None if prompt_tokens < 0 else prompt_tokens,
+            completion_tokens=None if completion_tokens < 0 else completion_tokens,
+            total_tokens=None if total_tokens < 0 else total_tokens,
+            error_message=self.error_messages[slot],
+            retry_count=self.retry_counts[slot],
+            rate_limit_delay=None if math.isnan(delay) else delay
+        )
 
 
 class LLMPerformanceMonitor:
     """Monitor for tracking LLM provider performance and reliability."""
     
-    def __init__(self, metrics_collector: Optional[MetricsCollector] = None, max_history: int = 1000):
+    def __init__(self, metrics_collector: Optional[MetricsCollector] = None, max_history: int = 1000,
+                 max_active_requests: int = 10000):
         """Initialize LLM performance monitor.
         
         Args:
             metrics_collector: MetricsCollector instance to use
             max_history: Maximum number of request records to keep per provider
+            max_active_requests: Maximum number of in-flight requests to track;
+                the oldest are dropped when requests are never completed
         """
         self.metrics = metrics_collector or get_metrics_collector()
         self.logger = logging.getLogger(__name__)
         self.max_history = max_history
-        
-        # Store request history per provider
-        self._request_history: Dict[str, deque] = defaultdict(lambda: deque(maxlen=max_history))
-        self._provider_stats: Dict[str, LLMProviderStats] = {}
-        
-        # Track active requests
-        self._active_requests: Dict[str, LLMRequestMetrics] = {}
+        self.max_active_requests = max_active_requests
+        
+        # Guards active requests, history, provider stats and aggregates so
+        # readers never observe a half-applied update
+        self._lock = threading.RLock()
+        
+        # Store request history per provider; rings are only created when a
+        # request completes so lookups for unknown keys never add entries
+        self._request_history: Dict[Tuple[str, str], _RequestHistoryRing] = {}
+        self._provider_stats: Dict[Tuple[str, str], LLMProviderStats] = {}
+        
+        # Secondary index: provider -> provider/model keys in _provider_stats
+        self._provider_to_keys: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)
+        
+        # Track active requests in start order so abandoned ones can be evicted
+        self._active_requests: "OrderedDict[str, LLMRequestMetrics]" = OrderedDict()
+        
+        # Reused metric label dicts per (provider, model) and
+        # (provider, model, status); treat them as immutable
+        self._label_cache: Dict[Tuple[str, str], Dict[str, str]] = {}
+        self._completion_label_cache: Dict[Tuple[str, str, str], Dict[str, str]] = {}
+        
+        # Monitor-wide totals across all provider/model stats
+        self._agg_total_requests = 0
+        self._agg_total_successful = 0
+        self._agg_total_duration = 0.0
+        
+        # Short-lived performance report cache keyed on (stats version, since);
+        # the version is bumped whenever provider statistics change
+        self._stats_version = 0
+        self._report_ttl = 1.0
+        self._report_cache: Optional[Tuple[float, int, Optional[datetime], Dict[str, Any]]] = None
     
     def start_request(self, provider: str, model: str, request_id: str, 
                      prompt_tokens: Optional[int] = None) -> LLMRequestMetrics:
@@ -103,13 +293,21 @@ class LLMPerformanceMonitor:
             model=model,
             request_id=request_id,
             start_time=datetime.now(),
-            prompt_tokens=prompt_tokens
+            prompt_tokens=prompt_tokens,
+            start_monotonic=time.monotonic()
         )
         
-        self._active_requests[request_id] = request_metrics
+        with self._lock:
+            self._active_requests[request_id] = request_metrics
+            self._active_requests.move_to_end(request_id)
+            while len(self._active_requests) > self.max_active_requests:
+                evicted_id, _ = self._active_requests.popitem(last=False)
+                self.logger.warning(f"Dropped LLM request {evicted_id} that was never completed")
         
         # Record request start metrics
-        labels = {"provider": provider, "model": model}
+        labels = self._label_cache.get((provider, model))
+        if labels is None:
+            labels = self._label_cache.setdefault((provider, model), {"provider": provider, "model": model})
         self.metrics.increment_counter("llm_requests_started_total", 1.0, labels)
         
         self.logger.debug(f"Started tracking LLM request {request_id} for {provider}/{model}")
@@ -133,13 +331,12 @@ class LLMPerformanceMonitor:
         Returns:
             Completed LLMRequestMetrics object, or None if request not found
         """
-        if request_id not in self._active_requests:
+        with self._lock:
+            request_metrics = self._active_requests.pop(request_id, None)
+        if request_metrics is None:
             self.logger.warning(f"Attempted to complete unknown request {request_id}")
             return None
         
-        request_metrics = self._active_requests.pop(request_id)
-        request_metrics.end_time = datetime.now()
-        request_metrics.duration_seconds = (request_metrics.end_time - request_metrics.start_time).total_seconds()
         request_metrics.status = status
         request_metrics.completion_tokens = completion_tokens
         request_metrics.error_message = error_message
@@ -150,31 +347,47 @@ class LLMPerformanceMonitor:
         if request_metrics.prompt_tokens and completion_tokens:
             request_metrics.total_tokens = request_metrics.prompt_tokens + completion_tokens
         
-        # Store in history
-        provider_key = f"{request_metrics.provider}/{request_metrics.model}"
-        self._request_history[provider_key].append(request_metrics)
-        
-        # Update provider statistics
-        self._update_provider_stats(request_metrics)
+        with self._lock:
+            # Take the end time under the lock that appends to history, so
+            # rows land in end-time order for get_recent_requests
+            request_metrics.end_time = datetime.now()
+            request_metrics.duration_seconds = time.monotonic() - request_metrics.start_monotonic
+            
+            # Store in history
+            provider_key = (request_metrics.provider, request_metrics.model)
+            history = self._request_history.get(provider_key)
+            if history is None:
+                history = self._request_history[provider_key] = _RequestHistoryRing(self.max_history)
+            history.append(request_metrics)
+            
+            # Update provider statistics
+            self._update_provider_stats(request_metrics)
         
         # Record completion metrics
-        labels = {
-            "provider": request_metrics.provider,
-            "model": request_metrics.model,
-            "status": status.value
-        }
+        label_key = (request_metrics.provider, request_metrics.model, status.value)
+        labels = self._completion_label_cache.get(label_key)
+        if labels is None:
+            labels = self._completion_label_cache.setdefault(label_key, {
+                "provider": request_metrics.provider,
+                "model": request_metrics.model,
+                "status": status.value
+            })
         
-        self.metrics.increment_counter("llm_requests_completed_total", 1.0, labels)
-        self.metrics.record_timer("llm_request_duration_seconds", request_metrics.duration_seconds, labels)
+        samples = [("counter", "llm_requests_completed_total", 1.0)]
         
-        if request_metrics.total_tokens:
-            self.metrics.record_histogram("llm_tokens_total", request_metrics.total_tokens, labels)
+        if request_metrics.duration_seconds:
+            samples.append(("timer", "llm_request_duration_seconds", request_metrics.duration_seconds))
+        
+        if request_metrics.total_tokens is not None and request_metrics.total_tokens > 0:
+            samples.append(("histogram", "llm_tokens_total", request_metrics.total_tokens))
         
         if retry_count > 0:
-            self.metrics.record_histogram("llm_retry_count", retry_count, labels)
+            samples.append(("histogram", "llm_retry_count", retry_count))
         
         if rate_limit_delay:
-            self.metrics.record_histogram("llm_rate_limit_delay_seconds", rate_limit_delay, labels)
+            samples.append(("histogram", "llm_rate_limit_delay_seconds", rate_limit_delay))
+        
+        self.metrics.record_batch(samples, labels)
         
         # Log completion
         if status == LLMRequestStatus.SUCCESS:
@@ -194,47 +407,41 @@ class LLMPerformanceMonitor:
         Returns:
             LLMProviderStats object or None if not found
         """
-        if model:
-            key = f"{provider}/{model}"
-            return self._provider_stats.get(key)
-        else:
-            # Aggregate stats across all models for this provider
-            provider_stats = None
-            for key, stats in self._provider_stats.items():
-                if stats.provider == provider:
-                    if provider_stats is None:
-                        provider_stats = LLMProviderStats(provider=provider, model="*")
-                    
-                    # Aggregate the stats
-                    provider_stats.total_requests += stats.total_requests
-                    provider_stats.successful_requests += stats.successful_requests
-                    provider_stats.failed_requests += stats.failed_requests
-                    provider_stats.timeout_requests += stats.timeout_requests
-                    provider_stats.rate_limited_requests += stats.rate_limited_requests
-                    provider_stats.auth_error_requests += stats.auth_error_requests
-                    provider_stats.invalid_response_requests += stats.invalid_response_requests
-                    provider_stats.total_duration += stats.total_duration
-                    provider_stats.total_tokens += stats.total_tokens
-                    provider_stats.total_prompt_tokens += stats.total_prompt_tokens
-                    provider_stats.total_completion_tokens += stats.total_completion_tokens
-                    provider_stats.total_retries += stats.total_retries
-                    
-                    if stats.last_request_time:
-                        if not provider_stats.last_request_time or stats.last_request_time > provider_stats.last_request_time:
-                            provider_stats.last_request_time = stats.last_request_time
-                    
-                    provider_stats.recent_errors.extend(stats.recent_errors[-5:])  # Keep recent errors
-            
-            # Calculate aggregated rates
-            if provider_stats and provider_stats.total_requests > 0:
-                provider_stats.success_rate = provider_stats.successful_requests / provider_stats.total_requests
-                provider_stats.error_rate = provider_stats.failed_requests / provider_stats.total_requests
-                provider_stats.avg_duration = provider_stats.total_duration / provider_stats.total_requests
+        with self._lock:
+            if model:
+                return self._provider_stats.get((provider, model))
+            else:
+                # Aggregate stats across all models for this provider
+                provider_stats = None
+                for key in self._provider_to_keys.get(provider, ()):
+                    stats = self._provider_stats.get(key)
+                    if stats is not None:
+                        if provider_stats is None:
+                            provider_stats = LLMProviderStats(provider=provider, model="*")
+                        
+                        # Aggregate the stats
+                        provider_stats.total_requests += stats.total_requests
+                        provider_stats.successful_requests += stats.successful_requests
+                        provider_stats.failed_requests += stats.failed_requests
+                        for index, count in enumerate(stats.status_counts):
+                            provider_stats.status_counts[index] += count
+                        provider_stats.total_duration += stats.total_duration
+                        provider_stats.total_tokens += stats.total_tokens
+                        provider_stats.total_prompt_tokens += stats.total_prompt_tokens
+                        provider_stats.total_completion_tokens += stats.total_completion_tokens
+                        provider_stats.total_retries += stats.total_retries
+                        
+                        if stats.last_request_time:
+                            if not provider_stats.last_request_time or stats.last_request_time > provider_stats.last_request_time:
+                                provider_stats.last_request_time = stats.last_request_time
+                        
+                        # Keep recent errors
+                        provider_stats.recent_errors.extend(
+                            islice(stats.recent_errors, max(0, len(stats.recent_errors) - 5), None)
+                        )
                 
-                if provider_stats.total_duration > 0:
-                    provider_stats.tokens_per_second = provider_stats.total_tokens / provider_stats.total_duration
-            
-            return provider_stats
+                # Aggregated rates are derived from the summed counters on read
+                return provider_stats
     
     def get_all_provider_stats(self) -> Dict[str, LLMProviderStats]:
         """Get statistics for all providers.
@@ -242,7 +449,8 @@ class LLMPerformanceMonitor:
         Returns:
             Dictionary mapping provider/model keys to LLMProviderStats
         """
-        return dict(self._provider_stats)
+        with self._lock:
+            return {f"{provider}/{model}": stats for (provider, model), stats in self._provider_stats.items()}
     
     def get_recent_requests(self, provider: str, model: str, 
                           since: Optional[datetime] = None, limit: int = 100) -> List[LLMRequestMetrics]:
@@ -257,105 +465,132 @@ class LLMPerformanceMonitor:
         Returns:
             List of recent LLMRequestMetrics
         """
-        key = f"{provider}/{model}"
-        
-        if key not in self._request_history:
-            return []
-        
-        requests = list(self._request_history[key])
-        
-        # Filter by timestamp if provided
-        if since:
-            requests = [r for r in requests if r.start_time >= since]
-        
-        # Sort by start time (most recent first) and limit
-        requests.sort(key=lambda r: r.start_time, reverse=True)
-        return requests[:limit]
+        with self._lock:
+            history = self._request_history.get((provider, model))
+            if history is None:
+                return []
+            
+            start_times = history.start_times
+            first = 0
+            
+            # Filter by timestamp if provided. Rows are appended in completion
+            # order, so end times are ascending and any request that started at or
+            # after `since` also ended after it: binary search the end-time column
+            # for the first candidate, then check start times within that window.
+            if since:
+                since_ts = since.timestamp()
+                end_times = history.end_times
+                first = bisect_left(
+                    range(len(history)), since_ts,
+                    key=lambda i: end_times[history.physical_index(i)]
+                )
+            
+            slots = [history.physical_index(i) for i in range(first, len(history))]
+            if since:
+                slots = [slot for slot in slots if start_times[slot] >= since_ts]
+            
+            # Sort the window by start time (most recent first), limit, then build objects
+            slots.sort(key=start_times.__getitem__, reverse=True)
+            return [history.row(slot, provider, model) for slot in slots[:limit]]
     
     def get_performance_report(self, since: Optional[datetime] = None) -> Dict[str, Any]:
         """Generate comprehensive LLM performance report.
         
+        Reports are cached for up to one second as long as no request has
+        completed in the meantime; callers must not mutate the result.
+        
         Args:
             since: Optional timestamp to filter metrics from
             
         Returns:
             Dictionary containing performance report
         """
-        report = {
-            "timestamp": datetime.now().isoformat(),
-            "providers": {},
-            "summary": {
-                "total_providers": 0,
-                "total_requests": 0,
-                "overall_success_rate": 0.0,
-                "overall_error_rate": 0.0,
-                "avg_response_time": 0.0
-            },
-            "alerts": []
-        }
-        
-        total_requests = 0
-        total_successful = 0
-        total_duration = 0.0
-        
-        # Generate report for each provider
-        for key, stats in self._provider_stats.items():
-            # Filter by time if specified
-            if since and stats.last_request_time and stats.last_request_time < since:
-                continue
+        with self._lock:
+            now = time.monotonic()
+            cached = self._report_cache
+            if (cached is not None and now - cached[0] < self._report_ttl
+                    and cached[1] == self._stats_version and cached[2] == since):
+                return cached[3]
             
-            provider_report = {
-                "provider": stats.provider,
-                "model": stats.model,
-                "total_requests": stats.total_requests,
-                "success_rate": stats.success_rate,
-                "error_rate": stats.error_rate,
-                "avg_duration": stats.avg_duration,
-                "tokens_per_second": stats.tokens_per_second,
-                "total_retries": stats.total_retries,
-                "last_request": stats.last_request_time.isoformat() if stats.last_request_time else None,
-                "recent_errors": stats.recent_errors[-3:],  # Last 3 errors
-                "status_breakdown": {
-                    "successful": stats.successful_requests,
-                    "failed": stats.failed_requests,
-                    "timeout": stats.timeout_requests,
-                    "rate_limited": stats.rate_limited_requests,
-                    "auth_error": stats.auth_error_requests,
-                    "invalid_response": stats.invalid_response_requests
-                }
+            report = {
+                "timestamp": _iso_now(),
+                "providers": {},
+                "summary": {
+                    "total_providers": 0,
+                    "total_requests": 0,
+                    "overall_success_rate": 0.0,
+                    "overall_error_rate": 0.0,
+                    "avg_response_time": 0.0
+                },
+                "alerts": []
             }
             
-            # Check for performance issues
-            alerts = []
-            if stats.success_rate < 0.95 and stats.total_requests > 10:
-                alerts.append(f"Low success rate: {stats.success_rate:.2%}")
+            total_requests = 0
+            total_successful = 0
+            total_duration = 0.0
             
-            if stats.avg_duration > 30.0:
-                alerts.append(f"High average response time: {stats.avg_duration:.1f}s")
+            # Generate report for each provider
+            for (provider, model), stats in self._provider_stats.items():
+                # Filter by time if specified
+                if since and stats.last_request_time and stats.last_request_time < since:
+                    continue
+                
+                # Derived rates are properties; evaluate each once per report
+                success_rate = stats.success_rate
+                avg_duration = stats.avg_duration
+                
+                provider_report = {
+                    "provider": stats.provider,
+                    "model": stats.model,
+                    "total_requests": stats.total_requests,
+                    "success_rate": success_rate,
+                    "error_rate": stats.error_rate,
+                    "avg_duration": avg_duration,
+                    "tokens_per_second": stats.tokens_per_second,
+                    "total_retries": stats.total_retries,
+                    "last_request": stats.last_request_time_iso,
+                    "recent_errors": list(islice(stats.recent_errors, max(0, len(stats.recent_errors) - 3), None)),  # Last 3 errors
+                    "status_breakdown": {
+                        "successful": stats.successful_requests,
+                        "failed": stats.failed_requests,
+                        "timeout": stats.timeout_requests,
+                        "rate_limited": stats.rate_limited_requests,
+                        "auth_error": stats.auth_error_requests,
+                        "invalid_response": stats.invalid_response_requests
+                    }
+                }
+                
+                key = f"{provider}/{model}"
+                
+                # Alerts are re-evaluated whenever a request completes
+                alerts = stats.current_alerts
+                provider_report["alerts"] = alerts
+                report["alerts"].extend([f"{key}: {alert}" for alert in alerts])
+                
+                report["providers"][key] = provider_report
+                
+                # Aggregate for summary (only needed when filtering by time)
+                if since:
+                    total_requests += stats.total_requests
+                    total_successful += stats.successful_requests
+                    total_duration += stats.total_duration
             
-            if stats.rate_limited_requests > stats.total_requests * 0.1:
-                alerts.append("High rate limiting frequency")
+            if not since:
+                total_requests = self._agg_total_requests
+                total_successful = self._agg_total_successful
+                total_duration = self._agg_total_duration
             
-            provider_report["alerts"] = alerts
-            report["alerts"].extend([f"{key}: {alert}" for alert in alerts])
+            # Calculate overall summary
+            report["summary"]["total_providers"] = len(report["providers"])
+            report["summary"]["total_requests"] = total_requests
             
-            report["providers"][key] = provider_report
+            if total_requests > 0:
+                report["summary"]["overall_success_rate"] = total_successful / total_requests
+                report["summary"]["overall_error_rate"] = (total_requests - total_successful) / total_requests
+                report["summary"]["avg_response_time"] = total_duration / total_requests
             
-            # Aggregate for summary
-            total_requests += stats.total_requests
-            total_successful += stats.successful_requests
-            total_duration += stats.total_duration
-        
-        # Calculate overall summary
-        report["summary"]["total_providers"] = len(report["providers"])
-        report["summary"]["total_requests"] = total_requests
-        
-        if total_requests > 0:
-            report["summary"]["overall_success_rate"] = total_successful / total_requests
-            report["summary"]["overall_error_rate"] = (total_requests - total_successful) / total_requests
-            report["summary"]["avg_response_time"] = total_duration / total_requests
-        
-        return report
+            self._report_cache = (now, self._stats_version, since, report)
+            return report
     
     def clear_history(self, provider: Optional[str] = None, model: Optional[str] = None):
         """Clear request history and statistics.
@@ -364,70 +599,78 @@ class LLMPerformanceMonitor:
             provider: Optional provider to clear (if None, clears all)
             model: Optional model to clear (requires provider)
         """
-        if provider and model:
-            key = f"{provider}/{model}"
-            if key in self._request_history:
-                self._request_history[key].clear()
-            if key in self._provider_stats:
-                del self._provider_stats[key]
-        elif provider:
-            # Clear all models for this provider
-            keys_to_remove = [key for key in self._request_history.keys() if key.startswith(f"{provider}/")]
-            for key in keys_to_remove:
-                self._request_history[key].clear()
+        with self._lock:
+            if provider and model:
+                key = (provider, model)
+                history = self._request_history.get(key)
+                if history is not None:
+                    history.clear()
                 if key in self._provider_stats:
                     del self._provider_stats[key]
-        else:
-            # Clear everything
-            self._request_history.clear()
-            self._provider_stats.clear()
-        
-        self.logger.info(f"Cleared LLM monitoring history for {provider or 'all providers'}")
+                self._provider_to_keys.get(provider, set()).discard(key)
+            elif provider:
+                # Clear all models for this provider
+                keys_to_remove = [key for key in self._request_history if key[0] == provider]
+                for key in keys_to_remove:
+                    self._request_history[key].clear()
+                    if key in self._provider_stats:
+                        del self._provider_stats[key]
+                self._provider_to_keys.pop(provider, None)
+            else:
+                # Clear everything
+                self._request_history.clear()
+                self._provider_stats.clear()
+                self._provider_to_keys.clear()
+            
+            # Rebuild monitor-wide totals from the remaining stats
+            self._agg_total_requests = sum(stats.total_requests for stats in self._provider_stats.values())
+            self._agg_total_successful = sum(stats.successful_requests for stats in self._provider_stats.values())
+            self._agg_total_duration = sum(stats.total_duration for stats in self._provider_stats.values())
+            
+            self._stats_version += 1
+            self.logger.info(f"Cleared LLM monitoring history for {provider or 'all providers'}")
     
     def _update_provider_stats(self, request_metrics: LLMRequestMetrics):
         """Update provider statistics with completed request.
         
+        Must be called with self._lock held.
+        
         Args:
             request_metrics: Completed request metrics
         """
-        key = f"{request_metrics.provider}/{request_metrics.model}"
+        key = (request_metrics.provider, request_metrics.model)
         
         if key not in self._provider_stats:
             self._provider_stats[key] = LLMProviderStats(
                 provider=request_metrics.provider,
                 model=request_metrics.model
             )
+            self._provider_to_keys[request_metrics.provider].add(key)
         
         stats = self._provider_stats[key]
+        self._stats_version += 1
         
         # Update counters
         stats.total_requests += 1
+        self._agg_total_requests += 1
         stats.last_request_time = request_metrics.end_time
         
+        stats.status_counts[_STATUS_INDEX[request_metrics.status]] += 1
+        
         if request_metrics.status == LLMRequestStatus.SUCCESS:
             stats.successful_requests += 1
+            self._agg_total_successful += 1
         else:
             stats.failed_requests += 1
             
-            # Track specific error types
-            if request_metrics.status == LLMRequestStatus.TIMEOUT:
-                stats.timeout_requests += 1
-            elif request_metrics.status == LLMRequestStatus.RATE_LIMITED:
-                stats.rate_limited_requests += 1
-            elif request_metrics.status == LLMRequestStatus.AUTHENTICATION_ERROR:
-                stats.auth_error_requests += 1
-            elif request_metrics.status == LLMRequestStatus.INVALID_RESPONSE:
-                stats.invalid_response_requests += 1
-            
-            # Keep recent error messages
+            # Keep recent error messages (bounded deque evicts the oldest)
             if request_metrics.error_message:
                 stats.recent_errors.append(request_metrics.error_message)
-                if len(stats.recent_errors) > 10:
-                    stats.recent_errors = stats.recent_errors[-10:]
         
         # Update timing and token stats
         if request_metrics.duration_seconds:
             stats.total_duration += request_metrics.duration_seconds
+            self._agg_total_duration += request_metrics.duration_seconds
         
         if request_metrics.total_tokens:
             stats.total_tokens += request_metrics.total_tokens
@@ -440,92 +683,33 @@ class LLMPerformanceMonitor:
         
         stats.total_retries += request_metrics.retry_count
         
-        # Calculate derived metrics
-        if stats.total_requests > 0:
-            stats.success_rate = stats.successful_requests / stats.total_requests
-            stats.error_rate = stats.failed_requests / stats.total_requests
-            stats.avg_duration = stats.total_duration / stats.total_requests
-            
-            if stats.total_duration > 0:
-                stats.tokens_per_second = stats.total_tokens / stats.total_duration
-
-
-class LLMRequestTracker:
-    """Context manager for tracking LLM requests."""
+        # Performance alerts only change when a request completes, so evaluate
+        # them here rather than on every report
+        stats.current_alerts = self._evaluate_alerts(stats)
     
-    def __init__(self, monitor: LLMPerformanceMonitor, provider: str, model: str, 
-                 request_id: str, prompt_tokens: Optional[int] = None):
-        """Initialize request tracker.
+    def _evaluate_alerts(self, stats: LLMProviderStats) -> List[str]:
+        """Check provider statistics against the alert thresholds.
         
         Args:
-            monitor: LLMPerformanceMonitor instance
-            provider: LLM provider name
-            model: Model name
-            request_id: Unique request identifier
-            prompt_tokens: Number of prompt tokens
-        """
-        self.monitor = monitor
-        self.provider = provider
-        self.model = model
-        self.request_id = request_id
-        self.prompt_tokens = prompt_tokens
-        self.request_metrics = None
-    
-    def __enter__(self):
-        """Start tracking the request."""
-        self.request_metrics = self.monitor.start_request(
-            self.provider, self.model, self.request_id, self.prompt_tokens
-        )
-        return self
-    
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Complete tracking the request."""
-        if exc_type is None:
-            # Success case
-            self.monitor.complete_request(self.request_id, LLMRequestStatus.SUCCESS)
-        else:
-            # Error case - determine error type
-            error_message = str(exc_val) if exc_val else "Unknown error"
-            
-            if "timeout" in error_message.lower():
-                status = LLMRequestStatus.TIMEOUT
-            elif "rate limit" in error_message.lower() or "429" in error_message:
-                status = LLMRequestStatus.RATE_LIMITED
-            elif "auth" in error_message.lower() or "401" in error_message or "403" in error_message:
-                status = LLMRequestStatus.AUTHENTICATION_ERROR
-            elif "invalid" in error_message.lower() or "malformed" in error_message.lower():
-                status = LLMRequestStatus.INVALID_RESPONSE
-            else:
-                status = LLMRequestStatus.ERROR
+            stats: Provider statistics to check
             
-            self.monitor.complete_request(self.request_id, status, error_message=error_message)
-    
-    def set_completion_tokens(self, tokens: int):
-        """Set the number of completion tokens for this request.
-        
-        Args:
-            tokens: Number of completion tokens
+        Returns:
+            List of alert messages
         """
-        if self.request_metrics:
-            self.request_metrics.completion_tokens = tokens
-    
-    def set_retry_count(self, count: int):
-        """Set the retry count for this request.
+        alerts = []
+        success_rate = stats.success_rate
+        avg_duration = stats.avg_duration
         
-        Args:
-            count: Number of retries performed
-        """
-        if self.request_metrics:
-            self.request_metrics.retry_count = count
-    
-    def set_rate_limit_delay(self, delay: float):
-        """Set the total rate limit delay for this request.
+        if success_rate < 0.95 and stats.total_requests > 10:
+            alerts.append(f"Low success rate: {success_rate:.2%}")
         
-        Args:
-            delay: Total delay in seconds due to rate limiting
-        """
-        if self.request_metrics:
-            self.request_metrics.rate_limit_delay = delay
+        if avg_duration > 30.0:
+            alerts.append(f"High average response time: {avg_duration:.1f}s")
+        
+        if stats.rate_limited_requests > stats.total_requests * 0.1:
+            alerts.append("High rate limiting frequency")
+        
+        return alerts
 
 
 # Global LLM performance monitor instance
@@ -542,9 +726,14 @@ def get_llm_monitor() -> LLMPerformanceMonitor:
     return _global_llm_monitor
 
 
+@contextmanager
 def track_llm_request(provider: str, model: str, request_id: str, 
-                     prompt_tokens: Optional[int] = None) -> LLMRequestTracker:
-    """Create a context manager for tracking an LLM request.
+                     prompt_tokens: Optional[int] = None) -> Iterator[LLMRequestMetrics]:
+    """Track an LLM request for the duration of a with-block.
+    
+    The yielded LLMRequestMetrics can be updated in place (completion_tokens,
+    retry_count, rate_limit_delay) before the block exits. Exceptions raised
+    inside the block are classified, recorded and re-raised.
     
     Args:
         provider: LLM provider name
@@ -552,7 +741,35 @@ def track_llm_request(provider: str, model: str, request_id: str,
         request_id: Unique request identifier
         prompt_tokens: Number of prompt tokens
         
-    Returns:
-        LLMRequestTracker context manager
+    Yields:
+        LLMRequestMetrics for the tracked request
     """
-    return LLMRequestTracker(get_llm_monitor(), provider, model, request_id, prompt_tokens)
\ No newline at end of file
+    monitor = get_llm_monitor()
+    request_metrics = monitor.start_request(provider, model, request_id, prompt_tokens)
+    try:
+        yield request_metrics
+    except BaseException as exc:
+        # Error case - determine error type
+        error_message = str(exc) or "Unknown error"
+        
+        status = LLMRequestStatus.ERROR
+        for pattern, pattern_status in _ERROR_PATTERNS:
+            if pattern.search(error_message):
+                status = pattern_status
+                break
+        
+        monitor.complete_request(
+            request_id, status,
+            completion_tokens=request_metrics.completion_tokens,
+            error_message=error_message,
+            retry_count=request_metrics.retry_count,
+            rate_limit_delay=request_metrics.rate_limit_delay
+        )
+        raise
+    else:
+        monitor.complete_request(
+            request_id, LLMRequestStatus.SUCCESS,
+            completion_tokens=request_metrics.completion_tokens,
+            retry_count=request_metrics.retry_count,
+            rate_limit_delay=request_metrics.rate_limit_delay
+        )
@@ -1,13 +1,92 @@
 """Logging configuration for comprehensive error tracking and debugging."""
 
+import atexit
+import copy
 import logging
 import logging.handlers
+import queue
+import re
 import sys
+import threading
+import time
 import json
-import traceback
+from collections import Counter, deque
+from itertools import islice
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from pathlib import Path
+from secrets import token_hex
+
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    _HAS_ORJSON = False
+
+
+# logging module globals controlling caller and thread/process lookups, as
+# they were at import; setup_logging restores them when caller info is needed
+_CALLER_INFO_GLOBALS = {
+    "_srcfile": logging._srcfile,
+    "logThreads": logging.logThreads,
+    "logProcesses": logging.logProcesses,
+    "logMultiprocessing": logging.logMultiprocessing,
+}
+
+# (epoch second, ISO string) of the most recently formatted second
+_LAST_ISO_SECOND = (None, "")
+
+
+def _iso_second(second: int) -> str:
+    """Format a whole epoch second as a local ISO 8601 string.
+    
+    The most recent second is cached, so callers formatting the current
+    time repeatedly only pay for it once per second.
+    """
+    global _LAST_ISO_SECOND
+    cached = _LAST_ISO_SECOND
+    if cached[0] != second:
+        cached = _LAST_ISO_SECOND = (second, datetime.fromtimestamp(second).isoformat())
+    return cached[1]
+
+
+def _iso_now() -> str:
+    """Return the current time as an ISO string at one-second granularity."""
+    return _iso_second(int(time.time()))
+
+
+def _record_iso_time(created: float) -> str:
+    """Format a record creation time as ISO 8601 with microseconds.
+    
+    The date and time part comes from the per-second cache, so bursts of
+    records only pay for formatting the fractional part.
+    """
+    second = int(created)
+    return f"{_iso_second(second)}.{min(int((created - second) * 1e6), 999999):06d}"
+
+
+# LogRecord attributes that are not copied into structured output as extras;
+# "message" is already emitted from getMessage()
+_STANDARD_LOGRECORD_ATTRS = frozenset({
+    'name', 'msg', 'args', 'levelname', 'levelno', 'pathname',
+    'filename', 'module', 'lineno', 'funcName', 'created',
+    'msecs', 'relativeCreated', 'thread', 'threadName',
+    'processName', 'process', 'getMessage', 'exc_info', 'exc_text', 'stack_info',
+    'message'
+})
+
+# Single-pass scrubbing of specific values from error messages for grouping.
+# Alternatives are tried in the order the replacements used to be applied, so
+# e.g. an all-digit run is still a number rather than a long id; only the UUID
+# alternative is case-insensitive.
+_SCRUB_RE = re.compile(
+    r'(?P<UUID>(?i:\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b))'
+    r'|(?P<TIMESTAMP>\b\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})'
+    r'|(?P<NUMBER>\b\d+\b)'
+    r'|(?P<LONG_ID>\b[a-zA-Z0-9_]{20,}\b)'
+)
+_SCRUB_TOKENS = {name: f"<{name}>" for name in _SCRUB_RE.groupindex}
 
 
 class JSONFormatter(logging.Formatter):
@@ -17,7 +96,7 @@ class JSONFormatter(logging.Formatter):
         """Format log record as JSON."""
         
         log_entry = {
-            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "timestamp": _record_iso_time(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -28,19 +107,31 @@ class JSONFormatter(logging.Formatter):
         
         # Add exception information if present
         if record.exc_info:
+            # Share the formatted traceback with other formatters through the
+            # standard exc_text cache instead of re-walking the traceback
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
             log_entry["exception"] = {
                 "type": record.exc_info[0].__name__ if record.exc_info[0] else None,
                 "message": str(record.exc_info[1]) if record.exc_info[1] else None,
-                "traceback": traceback.format_exception(*record.exc_info)
+                "traceback": record.exc_text
             }
         
-        # Add extra fields from record
-        for key, value in record.__dict__.items():
-            if key not in ['name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 
-                          'filename', 'module', 'lineno', 'funcName', 'created', 
-                          'msecs', 'relativeCreated', 'thread', 'threadName', 
-                          'processName', 'process', 'getMessage', 'exc_info', 'exc_text', 'stack_info']:
-                log_entry[key] = value
+        # Add extra fields from record; the set difference runs in C and is
+        # usually empty, and the keys are copied in record order when it isn't
+        record_dict = record.__dict__
+        extras = record_dict.keys() - _STANDARD_LOGRECORD_ATTRS
+        if extras:
+            for key, value in record_dict.items():
+                if key in extras:
+                    log_entry[key] = value
+        
+        if _HAS_ORJSON:
+            try:
+                return orjson.dumps(log_entry, default=str, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+            except orjson.JSONEncodeError:
+                # e.g. integers beyond 64 bits; fall back to the stdlib encoder
+                pass
         
         return json.dumps(log_entry, default=str, ensure_ascii=False)
 
@@ -49,67 +140,69 @@ class ErrorTrackingHandler(logging.Handler):
     """Custom handler for tracking error patterns and metrics."""
     
     def __init__(self):
-        super().__init__()
-        self.error_counts: Dict[str, int] = {}
-        self.error_patterns: Dict[str, int] = {}
-        self.recent_errors: list = []
+        # Only errors are tracked, so let the logging framework drop lower
+        # levels before emit is ever called
+        super().__init__(logging.ERROR)
+        self.error_counts: Counter = Counter()
+        self.error_patterns: Counter = Counter()
         self.max_recent_errors = 100
+        self.recent_errors: deque = deque(maxlen=self.max_recent_errors)
     
     def emit(self, record: logging.LogRecord):
         """Process log record for error tracking."""
         
-        if record.levelno >= logging.ERROR:
-            # Track error counts by logger
-            logger_name = record.name
-            self.error_counts[logger_name] = self.error_counts.get(logger_name, 0) + 1
-            
-            # Track error patterns by message
-            message_pattern = self._extract_pattern(record.getMessage())
-            self.error_patterns[message_pattern] = self.error_patterns.get(message_pattern, 0) + 1
-            
-            # Keep recent errors for analysis
-            error_info = {
-                "timestamp": datetime.fromtimestamp(record.created).isoformat(),
-                "logger": logger_name,
-                "level": record.levelname,
-                "message": record.getMessage(),
-                "pattern": message_pattern
-            }
-            
-            if record.exc_info:
-                error_info["exception_type"] = record.exc_info[0].__name__ if record.exc_info[0] else None
-            
-            self.recent_errors.append(error_info)
-            
-            # Keep only recent errors
-            if len(self.recent_errors) > self.max_recent_errors:
-                self.recent_errors = self.recent_errors[-self.max_recent_errors:]
+        if record.levelno < logging.ERROR:
+            return
+        
+        # Format the message once; getMessage re-applies msg % args on every call
+        message = record.getMessage()
+        logger_name = record.name
+        levelname = record.levelname
+        exc_info = record.exc_info
+        
+        # Track error counts by logger
+        self.error_counts[logger_name] += 1
+        
+        # Track error patterns by message
+        message_pattern = self._extract_pattern(message)
+        self.error_patterns[message_pattern] += 1
+        
+        # Keep recent errors for analysis
+        error_info = {
+            "timestamp": _record_iso_time(record.created),
+            "logger": logger_name,
+            "level": levelname,
+            "message": message,
+            "pattern": message_pattern
+        }
+        
+        if exc_info:
+            exc_type = exc_info[0]
+            error_info["exception_type"] = exc_type.__name__ if exc_type else None
+        
+        # Keep only recent errors (bounded deque evicts the oldest)
+        self.recent_errors.append(error_info)
     
     def _extract_pattern(self, message: str) -> str:
         """Extract error pattern from message for grouping."""
         
-        # Remove specific values to group similar errors
-        import re
-        
-        # Replace UUIDs, session IDs, timestamps, etc.
-        pattern = re.sub(r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b', 
-                        '<UUID>', message, flags=re.IGNORECASE)
-        pattern = re.sub(r'\b\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}', '<TIMESTAMP>', pattern)
-        pattern = re.sub(r'\b\d+\b', '<NUMBER>', pattern)
-        pattern = re.sub(r'\b[a-zA-Z0-9_]{20,}\b', '<LONG_ID>', pattern)
-        
-        return pattern
+        # Replace UUIDs, session IDs, timestamps, etc. to group similar errors
+        return _SCRUB_RE.sub(lambda match: _SCRUB_TOKENS[match.lastgroup], message)
     
     def get_error_summary(self) -> Dict[str, Any]:
-        """Get summary of tracked errors."""
-        
-        return {
-            "total_errors_by_logger": dict(self.error_counts),
-            "error_patterns": dict(sorted(self.error_patterns.items(), 
-                                        key=lambda x: x[1], reverse=True)[:10]),
-            "recent_error_count": len(self.recent_errors),
-            "most_recent_errors": self.recent_errors[-5:] if self.recent_errors else []
-        }
+        """Get summary of tracked errors.
+        
+        Taken under the handler lock, which emit() runs under, so the
+        counts and recent errors are a consistent snapshot.
+        """
+        
+        with self.lock:
+            return {
+                "total_errors_by_logger": dict(self.error_counts),
+                "error_patterns": dict(self.error_patterns.most_common(10)),
+                "recent_error_count": len(self.recent_errors),
+                "most_recent_errors": list(islice(self.recent_errors, max(0, len(self.recent_errors) - 5), None))
+            }
 
 
 class DebugInfoLogger:
@@ -122,10 +215,13 @@ class DebugInfoLogger:
                            request_id: Optional[str] = None):
         """Log detailed request information for debugging."""
         
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        
         debug_info = {
             "operation": operation,
             "request_id": request_id or self._generate_request_id(),
-            "request_size": len(str(request_data)),
+            "request_size": self._estimate_size(request_data),
             "has_document": "document" in request_data,
             "has_instruction": "instruction" in request_data
         }
@@ -148,9 +244,14 @@ class DebugInfoLogger:
                            error: Optional[Exception] = None):
         """Log LLM service interaction details."""
         
+        level = logging.DEBUG if error is None else logging.ERROR
+        if not self.logger.isEnabledFor(level):
+            return
+        
+        # Provider/model names repeat across calls; share one string object each
         interaction_info = {
-            "provider": provider,
-            "model": model,
+            "provider": sys.intern(provider),
+            "model": sys.intern(model),
             "prompt_size": prompt_size,
             "response_size": response_size,
             "duration_seconds": duration,
@@ -161,15 +262,17 @@ class DebugInfoLogger:
             interaction_info["error_type"] = type(error).__name__
             interaction_info["error_message"] = str(error)
         
-        level = logging.DEBUG if error is None else logging.ERROR
         self.logger.log(level, "LLM interaction", extra=interaction_info)
     
     def log_processing_stage(self, stage: str, document_size: Optional[int] = None,
                            changes_count: Optional[int] = None, duration: Optional[float] = None):
         """Log document processing stage information."""
         
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        
         stage_info = {
-            "processing_stage": stage,
+            "processing_stage": sys.intern(stage),
             "document_size": document_size,
             "changes_count": changes_count,
             "duration_seconds": duration
@@ -181,6 +284,10 @@ class DebugInfoLogger:
                              success: bool, details: Optional[Dict[str, Any]] = None):
         """Log session management operation details."""
         
+        level = logging.DEBUG if success else logging.WARNING
+        if not self.logger.isEnabledFor(level):
+            return
+        
         session_info = {
             "session_operation": operation,
             "session_id": session_id,
@@ -190,30 +297,86 @@ class DebugInfoLogger:
         if details:
             session_info.update(details)
         
-        level = logging.DEBUG if success else logging.WARNING
         self.logger.log(level, "Session operation", extra=session_info)
     
+    def _estimate_size(self, data: Any) -> int:
+        """Estimate the serialized size of request data."""
+        
+        if _HAS_ORJSON:
+            try:
+                # Byte length of the compact JSON encoding, computed in C
+                return len(orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS))
+            except orjson.JSONEncodeError:
+                pass
+        
+        return len(str(data))
+    
     def _generate_request_id(self) -> str:
         """Generate unique request ID for tracking."""
-        import uuid
-        return str(uuid.uuid4())[:8]
+        return token_hex(4)
     
-    def _calculate_depth(self, obj: Any, current_depth: int = 0) -> int:
+    def _calculate_depth(self, obj: Any) -> int:
         """Calculate maximum nesting depth of an object."""
         
-        if current_depth > 50:  # Prevent infinite recursion
-            return current_depth
-        
-        if isinstance(obj, dict):
-            if not obj:
-                return current_depth
-            return max(self._calculate_depth(value, current_depth + 1) for value in obj.values())
-        elif isinstance(obj, list):
-            if not obj:
-                return current_depth
-            return max(self._calculate_depth(item, current_depth + 1) for item in obj)
-        else:
-            return current_depth
+        # Iterative walk so deep documents neither recurse nor get truncated
+        max_depth = 0
+        stack = [(obj, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if depth > max_depth:
+                max_depth = depth
+            
+            if isinstance(node, dict):
+                children = node.values()
+            elif isinstance(node, list):
+                children = node
+            else:
+                continue
+            
+            child_depth = depth + 1
+            stack.extend((child, child_depth) for child in children)
+        
+        return max_depth
+
+
+class _LogQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that keeps exception info for the listener's handlers."""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Freeze the message but leave formatting to the target handlers."""
+        
+        # The stock implementation formats the record and drops exc_info, which
+        # would lose exception details in JSONFormatter and error tracking
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# Listener started by the most recent async setup_logging call
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+_queue_listener_lock = threading.Lock()
+
+
+def _set_queue_listener(listener: logging.handlers.QueueListener):
+    """Remember the active queue listener so it can be stopped later."""
+    global _queue_listener
+    
+    with _queue_listener_lock:
+        if _queue_listener is None:
+            atexit.register(_stop_queue_listener)
+        _queue_listener = listener
+
+
+def _stop_queue_listener():
+    """Stop the active queue listener, flushing any queued records."""
+    global _queue_listener
+    
+    with _queue_listener_lock:
+        listener, _queue_listener = _queue_listener, None
+    
+    if listener is not None:
+        listener.stop()
 
 
 def setup_logging(
@@ -221,19 +384,50 @@ def setup_logging(
     log_file: Optional[str] = None,
     enable_json_logging: bool = False,
     enable_error_tracking: bool = True,
-    enable_debug_logging: bool = False
+    enable_debug_logging: bool = False,
+    disable_caller_info: bool = False,
+    enable_async_logging: bool = False,
+    use_external_rotation: bool = False
 ) -> Dict[str, Any]:
-    """Set up comprehensive logging configuration."""
+    """Set up comprehensive logging configuration.
+    
+    With disable_caller_info, log calls skip the stack walk that fills in the
+    caller's file, line and function, and the thread/process lookups. This is
+    process-wide and only applied when no configured formatter uses those
+    fields (JSON logging and the file handler format both do); calls where it
+    doesn't apply restore the logging module's original behaviour.
+    
+    With enable_async_logging, the root logger only enqueues records; the
+    console, file and error tracking handlers run on a QueueListener thread.
+    The listener is returned as "queue_listener" and is stopped (flushing
+    queued records) on the next setup_logging call or at interpreter exit.
+    
+    With use_external_rotation, log_file is written through a
+    WatchedFileHandler that reopens the file after an external tool such as
+    logrotate moves it, instead of rotating it in-process.
+    """
     
     # Convert string level to logging constant
     numeric_level = getattr(logging, log_level.upper(), logging.INFO)
     
+    if disable_caller_info and not enable_json_logging and not log_file:
+        logging._srcfile = None
+        logging.logThreads = False
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+    else:
+        # Undo an earlier call that disabled them
+        for name, value in _CALLER_INFO_GLOBALS.items():
+            setattr(logging, name, value)
+    
     # Create root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(numeric_level)
     
     # Clear existing handlers
+    _stop_queue_listener()
     root_logger.handlers.clear()
+    handlers: List[logging.Handler] = []
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -247,16 +441,19 @@ def setup_logging(
         )
     
     console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
     # File handler (if specified)
     if log_file:
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
         
-        file_handler = logging.handlers.RotatingFileHandler(
-            log_file, maxBytes=10*1024*1024, backupCount=5  # 10MB files, keep 5 backups
-        )
+        if use_external_rotation:
+            file_handler = logging.handlers.WatchedFileHandler(log_file)
+        else:
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=256*1024*1024, backupCount=5  # 256MB files, keep 5 backups
+            )
         file_handler.setLevel(numeric_level)
         
         if enable_json_logging:
@@ -267,14 +464,24 @@ def setup_logging(
             )
         
         file_handler.setFormatter(file_formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
     
     # Error tracking handler
     error_tracker = None
     if enable_error_tracking:
         error_tracker = ErrorTrackingHandler()
-        error_tracker.setLevel(logging.WARNING)
-        root_logger.addHandler(error_tracker)
+        handlers.append(error_tracker)
+    
+    queue_listener = None
+    if enable_async_logging:
+        log_queue = queue.SimpleQueue()
+        root_logger.addHandler(_LogQueueHandler(log_queue))
+        queue_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        queue_listener.start()
+        _set_queue_listener(queue_listener)
+    else:
+        for handler in handlers:
+            root_logger.addHandler(handler)
     
     # Debug logger
     debug_logger = None
@@ -291,7 +498,8 @@ def setup_logging(
         "error_tracker": error_tracker,
         "debug_logger": debug_logger,
         "log_level": log_level,
-        "handlers_count": len(root_logger.handlers)
+        "handlers_count": len(handlers),
+        "queue_listener": queue_listener
     }
 
 
@@ -304,6 +512,9 @@ def log_performance_metrics(logger: logging.Logger, operation: str,
                           duration: float, **metrics):
     """Log performance metrics for operations."""
     
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     perf_info = {
         "operation": operation,
         "duration_seconds": duration,
@@ -317,6 +528,9 @@ def log_error_with_context(logger: logging.Logger, error: Exception,
                           context: Dict[str, Any], operation: str):
     """Log error with comprehensive context information."""
     
+    if not logger.isEnabledFor(logging.ERROR):
+        return
+    
     error_info = {
         "operation": operation,
         "error_type": type(error).__name__,
@@ -324,4 +538,4 @@ def log_error_with_context(logger: logging.Logger, error: Exception,
         **context
     }
     
-    logger.error(f"Error in {operation}: {str(error)}", extra=error_info, exc_info=True)
\ No newline at end of file
+    logger.error("Error in %s: %s", operation, error, extra=error_info, exc_info=True)
\ No newline at end of file
@@ -3,11 +3,16 @@
 import time
 import threading
 from collections import defaultdict, deque
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Iterable, Iterator, Set, Tuple, Union
 from enum import Enum
-import statistics
+from functools import lru_cache, wraps
+from itertools import islice
+from operator import attrgetter, itemgetter
+import bisect
+import math
 import logging
 
 
@@ -19,15 +24,20 @@ class MetricType(Enum):
     TIMER = "timer"
 
 
-@dataclass
+# Shared labels for unlabeled samples so recording doesn't allocate a dict per
+# sample; never mutate MetricValue.labels
+_EMPTY_LABELS: Dict[str, str] = {}
+
+
+@dataclass(slots=True)
 class MetricValue:
     """Individual metric value with timestamp."""
     value: float
-    timestamp: datetime
-    labels: Dict[str, str] = field(default_factory=dict)
+    timestamp: float  # Unix time, as returned by time.time()
+    labels: Dict[str, str] = field(default_factory=lambda: _EMPTY_LABELS)
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricSummary:
     """Summary statistics for a metric."""
     name: str
@@ -42,22 +52,374 @@ class MetricSummary:
     last_updated: Optional[datetime] = None
 
 
+@dataclass(slots=True)
+class _WindowStats:
+    """Running aggregates over the values currently held in a metric's history."""
+    total: float = 0.0
+    min_value: float = float("inf")
+    max_value: float = float("-inf")
+    # Set when an evicted value was the min or max; rebuilt on next read
+    stale: bool = False
+
+
+# Histogram percentile accuracy: bins grow geometrically by _SKETCH_GAMMA so
+# any value is within 1% of its bin's representative value
+_SKETCH_RELATIVE_ERROR = 0.01
+_SKETCH_GAMMA = (1 + _SKETCH_RELATIVE_ERROR) / (1 - _SKETCH_RELATIVE_ERROR)
+_SKETCH_INV_LOG_GAMMA = 1 / math.log(_SKETCH_GAMMA)
+
+# Bound once; these run several times per recorded sample
+_log = math.log
+_ceil = math.ceil
+_now = time.time
+
+
+class _LogHistogram:
+    """Log-linear bucketed histogram that supports removing values.
+    
+    Memory is bounded by the number of distinct bins rather than the number
+    of samples, and percentiles carry at most _SKETCH_RELATIVE_ERROR relative
+    error. Supporting remove lets it track exactly the values in a bounded
+    history window.
+    """
+    
+    __slots__ = ("positive", "negative", "zero_count", "count")
+    
+    def __init__(self):
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+    
+    def add(self, value: float):
+        """Add a value to the histogram."""
+        self.count += 1
+        # Bin index is ceil(log_gamma(|value|)), inlined for the record path
+        if value > 0:
+            index = _ceil(_log(value) * _SKETCH_INV_LOG_GAMMA)
+            bins = self.positive
+        elif value < 0:
+            index = _ceil(_log(-value) * _SKETCH_INV_LOG_GAMMA)
+            bins = self.negative
+        else:
+            self.zero_count += 1
+            return
+        bins[index] = bins.get(index, 0) + 1
+    
+    def remove(self, value: float):
+        """Remove a value previously passed to add()."""
+        self.count -= 1
+        if value > 0:
+            bins, index = self.positive, _ceil(_log(value) * _SKETCH_INV_LOG_GAMMA)
+        elif value < 0:
+            bins, index = self.negative, _ceil(_log(-value) * _SKETCH_INV_LOG_GAMMA)
+        else:
+            self.zero_count -= 1
+            return
+        
+        remaining = bins[index] - 1
+        if remaining:
+            bins[index] = remaining
+        else:
+            del bins[index]
+    
+    def merge(self, other: "_LogHistogram"):
+        """Add all of another histogram's values to this one."""
+        for index, n in other.positive.items():
+            self.positive[index] = self.positive.get(index, 0) + n
+        for index, n in other.negative.items():
+            self.negative[index] = self.negative.get(index, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+    
+    def clear(self):
+        """Remove all values."""
+        self.positive.clear()
+        self.negative.clear()
+        self.zero_count = 0
+        self.count = 0
+    
+    def percentiles(self, percentiles: Iterable[float]) -> List[float]:
+        """Estimate percentiles, interpolating between ranks like _percentile.
+        
+        Args:
+            percentiles: Percentiles to estimate (0-100)
+            
+        Returns:
+            Estimated values, in the order requested
+        """
+        if not self.count:
+            return [0.0 for _ in percentiles]
+        
+        scale = 2 / (1 + _SKETCH_GAMMA)
+        # (upper rank, representative value) per bin, in ascending value order
+        ranks: List[Tuple[int, float]] = []
+        seen = 0
+        for index in sorted(self.negative, reverse=True):
+            seen += self.negative[index]
+            ranks.append((seen, -scale * _SKETCH_GAMMA ** index))
+        if self.zero_count:
+            seen += self.zero_count
+            ranks.append((seen, 0.0))
+        for index in sorted(self.positive):
+            seen += self.positive[index]
+            ranks.append((seen, scale * _SKETCH_GAMMA ** index))
+        upper_ranks = [rank for rank, _ in ranks]
+        
+        def value_at(position: int) -> float:
+            return ranks[bisect.bisect_right(upper_ranks, position)][1]
+        
+        results = []
+        for percentile in percentiles:
+            index = (percentile / 100.0) * (self.count - 1)
+            lower_index = int(index)
+            weight = index - lower_index
+            lower = value_at(lower_index)
+            if weight:
+                upper = value_at(min(lower_index + 1, self.count - 1))
+                results.append(lower * (1 - weight) + upper * weight)
+            else:
+                results.append(lower)
+        return results
+
+
+class _Bucket:
+    """Aggregates for the samples recorded during one second."""
+    
+    __slots__ = ("second", "count", "total", "min_value", "max_value", "sketch")
+    
+    def __init__(self):
+        self.second = -1
+        self.count = 0
+        self.total = 0.0
+        self.min_value = float("inf")
+        self.max_value = float("-inf")
+        self.sketch = _LogHistogram()
+
+
+class _TimeWindow:
+    """Fixed ring of one-second buckets covering the last window_seconds.
+    
+    Unlike the count-bounded history deque, its aggregates always span the
+    same wall-clock duration regardless of traffic, and reading them costs
+    O(window_seconds) independent of the record rate.
+    """
+    
+    __slots__ = ("buckets", "last_value", "last_timestamp")
+    
+    def __init__(self, window_seconds: int):
+        self.buckets = [_Bucket() for _ in range(window_seconds)]
+        self.last_value: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+    
+    def add(self, value: float, timestamp: float):
+        """Add a sample to the bucket for its second."""
+        second = int(timestamp)
+        bucket = self.buckets[second % len(self.buckets)]
+        if bucket.second != second:
+            # The slot still holds a second that has left the window
+            bucket.second = second
+            bucket.count = 0
+            bucket.total = 0.0
+            bucket.min_value = float("inf")
+            bucket.max_value = float("-inf")
+            bucket.sketch.clear()
+        
+        bucket.count += 1
+        bucket.total += value
+        if value < bucket.min_value:
+            bucket.min_value = value
+        if value > bucket.max_value:
+            bucket.max_value = value
+        bucket.sketch.add(value)
+        self.last_value = value
+        self.last_timestamp = timestamp
+    
+    def summarize(self, name: str, metric_type: MetricType, now: float) -> MetricSummary:
+        """Summarize the buckets that fall inside the window ending at now.
+        
+        Args:
+            name: Metric name reported in the summary
+            metric_type: Metric type reported in the summary
+            now: Unix time the window ends at
+            
+        Returns:
+            MetricSummary; values are None when the window is empty
+        """
+        oldest = int(now) - len(self.buckets)
+        live = [bucket for bucket in self.buckets if bucket.second > oldest and bucket.count]
+        summary = MetricSummary(name=name, metric_type=metric_type)
+        if not live:
+            return summary
+        
+        merged = _LogHistogram()
+        count = 0
+        total = 0.0
+        for bucket in live:
+            count += bucket.count
+            total += bucket.total
+            merged.merge(bucket.sketch)
+        min_value = min(bucket.min_value for bucket in live)
+        max_value = max(bucket.max_value for bucket in live)
+        
+        summary.current_value = self.last_value
+        summary.total_count = count
+        summary.min_value = min_value
+        summary.max_value = max_value
+        summary.avg_value = total / count
+        summary.last_updated = datetime.fromtimestamp(self.last_timestamp)
+        if count >= 2:
+            summary.p95_value, summary.p99_value = (
+                min(max(value, min_value), max_value)
+                for value in merged.percentiles((95, 99))
+            )
+        return summary
+    
+    def stat(self, stat: str, now: float) -> Optional[float]:
+        """Compute a single statistic over the window ending at now.
+        
+        Only the buckets' aggregates needed for the statistic are combined;
+        sketches are merged only for percentiles.
+        
+        Args:
+            stat: One of "max", "min", "avg", "p95", "p99" or "current"
+            now: Unix time the window ends at
+            
+        Returns:
+            The statistic, or None when the window has no (or too few) samples
+        """
+        oldest = int(now) - len(self.buckets)
+        live = [bucket for bucket in self.buckets if bucket.second > oldest and bucket.count]
+        if not live:
+            return None
+        
+        if stat == "max":
+            return max(bucket.max_value for bucket in live)
+        if stat == "min":
+            return min(bucket.min_value for bucket in live)
+        if stat == "avg":
+            return sum(bucket.total for bucket in live) / sum(bucket.count for bucket in live)
+        if stat in ("p95", "p99"):
+            merged = _LogHistogram()
+            for bucket in live:
+                merged.merge(bucket.sketch)
+            if merged.count < 2:
+                return None
+            value = merged.percentiles((95 if stat == "p95" else 99,))[0]
+            return min(max(value, min(bucket.min_value for bucket in live)),
+                       max(bucket.max_value for bucket in live))
+        return self.last_value
+
+
+@lru_cache(maxsize=4096)
+def _make_key(name: str, label_items: frozenset) -> str:
+    """Build a metric key from a name and its label pairs.
+    
+    Cached because the same (name, labels) combinations are recorded over
+    and over.
+    
+    Args:
+        name: Metric name, or "" for just the label suffix
+        label_items: Frozenset of (label, value) pairs
+        
+    Returns:
+        Metric key such as "name{a=1,b=2}"
+    """
+    # Sort labels for consistent key generation
+    label_str = ','.join(f"{k}={v}" for k, v in sorted(label_items))
+    return f"{name}{{{label_str}}}"
+
+
+# bisect keys for the two history element shapes
+_timestamp_of = attrgetter("timestamp")
+_first_item = itemgetter(0)
+
+# Alert threshold type -> statistic it is compared against; anything else
+# compares the current value
+_THRESHOLD_STATS = {
+    "max": "max",
+    "min": "min",
+    "avg_max": "avg",
+    "p95_max": "p95",
+    "p99_max": "p99",
+}
+
+# record_batch kinds
+_KIND_TYPES = {
+    "counter": MetricType.COUNTER,
+    "gauge": MetricType.GAUGE,
+    "histogram": MetricType.HISTOGRAM,
+    "timer": MetricType.TIMER,
+}
+
+# Number of lock stripes in a MetricsCollector; must be a power of two
+_NUM_SHARDS = 16
+_SHARD_MASK = _NUM_SHARDS - 1
+
+
+class _Shard:
+    """One lock-striped partition of a MetricsCollector's per-key state."""
+    
+    __slots__ = ("lock", "max_history", "window_seconds", "metrics", "values", "types", "labels",
+                 "counters", "gauges", "stats", "sketches", "windows")
+    
+    def __init__(self, max_history: int, window_seconds: int):
+        self.lock = threading.Lock()
+        self.max_history = max_history
+        self.window_seconds = window_seconds
+        # Per-key structures are plain dicts filled together by
+        # MetricsCollector._ensure_key_locked, so a key present in metrics is
+        # present in values, types, labels and stats (and, for histograms and
+        # timers, sketches and windows) too.
+        # History per key: MetricValue objects for histograms and timers,
+        # plain (timestamp, value) tuples for counters and gauges
+        self.metrics: Dict[str, deque] = {}
+        # Bare float values parallel to metrics, so summaries can aggregate
+        # without unpacking MetricValue objects into a temporary list
+        self.values: Dict[str, deque] = {}
+        # Metric type per key, fixed by the first record
+        self.types: Dict[str, MetricType] = {}
+        # Labels per key; part of the key, so identical for all its samples
+        self.labels: Dict[str, Dict[str, str]] = {}
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.stats: Dict[str, _WindowStats] = {}
+        # Histogram/timer windows mirrored into a bucketed sketch so
+        # percentile reads don't have to sort the window
+        self.sketches: Dict[str, _LogHistogram] = {}
+        # Histogram/timer samples over the last window_seconds, for alerting
+        self.windows: Dict[str, _TimeWindow] = {}
+
+
 class MetricsCollector:
     """Thread-safe metrics collector for performance monitoring."""
     
-    def __init__(self, max_history: int = 1000):
+    def __init__(self, max_history: int = 1000, window_seconds: int = 60):
         """Initialize metrics collector.
         
         Args:
             max_history: Maximum number of historical values to keep per metric
+            window_seconds: Length of the time window used for histogram and
+                timer alerting (see get_window_summary)
         """
         self.max_history = max_history
-        self._metrics: Dict[str, deque] = defaultdict(lambda: deque(maxlen=max_history))
-        self._counters: Dict[str, float] = defaultdict(float)
-        self._gauges: Dict[str, float] = defaultdict(float)
-        self._lock = threading.RLock()
+        self.window_seconds = window_seconds
+        # Per-key state is striped across shards by key hash so recorders of
+        # different metrics don't contend on one lock. Shard locks are not
+        # re-entrant: helpers suffixed _locked expect the caller to hold one.
+        self._shards = [_Shard(max_history, window_seconds) for _ in range(_NUM_SHARDS)]
+        # Base metric name -> full keys recorded under it. Its lock is only
+        # ever taken after (never before) a shard lock.
+        self._base_names: Dict[str, Set[str]] = {}
+        self._base_names_lock = threading.Lock()
+        # Per-thread queue of record_timer samples while inside batch()
+        self._local = threading.local()
         self.logger = logging.getLogger(__name__)
     
+    def _shard(self, key: str) -> _Shard:
+        """Return the shard that owns a metric key."""
+        return self._shards[hash(key) & _SHARD_MASK]
+    
     def increment_counter(self, name: str, value: float = 1.0, labels: Optional[Dict[str, str]] = None):
         """Increment a counter metric.
         
@@ -66,16 +428,16 @@ class MetricsCollector:
             value: Value to increment by
             labels: Optional labels for the metric
         """
-        with self._lock:
-            key = self._get_metric_key(name, labels)
-            self._counters[key] += value
-            
-            metric_value = MetricValue(
-                value=self._counters[key],
-                timestamp=datetime.now(),
-                labels=labels or {}
-            )
-            self._metrics[key].append(metric_value)
+        # Key building and shard selection are inlined on the record paths
+        key = _make_key(name, frozenset(labels.items())) if labels else name
+        shard = self._shards[hash(key) & _SHARD_MASK]
+        now = _now()
+        
+        with shard.lock:
+            counters = shard.counters
+            total = counters[key] = counters.get(key, 0.0) + value
+            self._append_recycled(shard, name, key, total, now, labels or _EMPTY_LABELS,
+                                  MetricType.COUNTER)
     
     def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
         """Set a gauge metric value.
@@ -85,16 +447,14 @@ class MetricsCollector:
             value: Current value
             labels: Optional labels for the metric
         """
-        with self._lock:
-            key = self._get_metric_key(name, labels)
-            self._gauges[key] = value
-            
-            metric_value = MetricValue(
-                value=value,
-                timestamp=datetime.now(),
-                labels=labels or {}
-            )
-            self._metrics[key].append(metric_value)
+        key = _make_key(name, frozenset(labels.items())) if labels else name
+        shard = self._shards[hash(key) & _SHARD_MASK]
+        now = _now()
+        
+        with shard.lock:
+            shard.gauges[key] = value
+            self._append_recycled(shard, name, key, value, now, labels or _EMPTY_LABELS,
+                                  MetricType.GAUGE)
     
     def record_histogram(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
         """Record a histogram value.
@@ -104,25 +464,199 @@ class MetricsCollector:
             value: Value to record
             labels: Optional labels for the metric
         """
-        with self._lock:
-            key = self._get_metric_key(name, labels)
-            
-            metric_value = MetricValue(
-                value=value,
-                timestamp=datetime.now(),
-                labels=labels or {}
-            )
-            self._metrics[key].append(metric_value)
+        self._record_distribution(name, value, labels, MetricType.HISTOGRAM)
+    
+    def _record_distribution(self, name: str, value: float, labels: Optional[Dict[str, str]],
+                             metric_type: MetricType):
+        """Record a histogram or timer sample.
+        
+        Args:
+            name: Full metric name
+            value: Value to record
+            labels: Optional labels for the metric
+            metric_type: MetricType.HISTOGRAM or MetricType.TIMER
+        """
+        key = _make_key(name, frozenset(labels.items())) if labels else name
+        shard = self._shards[hash(key) & _SHARD_MASK]
+        now = _now()
+        
+        with shard.lock:
+            self._append_recycled(shard, name, key, value, now, labels or _EMPTY_LABELS, metric_type)
     
     def record_timer(self, name: str, duration: float, labels: Optional[Dict[str, str]] = None):
         """Record a timer duration.
         
+        Inside a batch() block the sample is queued and recorded when the
+        block exits.
+        
         Args:
             name: Metric name
             duration: Duration in seconds
             labels: Optional labels for the metric
         """
-        self.record_histogram(f"{name}_duration_seconds", duration, labels)
+        pending = getattr(self._local, "pending", None)
+        if pending is not None:
+            pending.append(("timer", name, duration, labels))
+            return
+        self._record_distribution(f"{name}_duration_seconds", duration, labels, MetricType.TIMER)
+    
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Queue record_timer calls made by this thread and record them together.
+        
+        The queued samples go through a single record_batch call on exit.
+        Nested blocks join the outermost one.
+        """
+        if getattr(self._local, "pending", None) is not None:
+            yield
+            return
+        
+        self._local.pending = pending = []
+        try:
+            yield
+        finally:
+            self._local.pending = None
+            if pending:
+                self.record_batch(pending)
+    
+    def record_batch(self, samples: Iterable[tuple], labels: Optional[Dict[str, str]] = None):
+        """Record several samples in one go.
+        
+        Label suffixes come from the key cache, the clock is read once and
+        each shard lock is taken once for the whole batch.
+        
+        Args:
+            samples: Iterable of (kind, name, value) or (kind, name, value, labels)
+                tuples, where kind is one of "counter", "gauge", "histogram"
+                or "timer". Per-sample labels replace the shared labels.
+            labels: Optional labels applied to samples without their own
+        """
+        label_suffix = self._get_label_suffix(labels)
+        labels = labels or _EMPTY_LABELS
+        
+        # Resolve keys up front so an unknown kind fails before anything is
+        # recorded, and group samples by shard
+        by_shard: Dict[int, List[Tuple[MetricType, str, str, float, Dict[str, str]]]] = defaultdict(list)
+        for sample in samples:
+            kind, name, value = sample[:3]
+            metric_type = _KIND_TYPES.get(kind)
+            if metric_type is None:
+                raise ValueError(f"Unknown metric kind: {kind}")
+            if metric_type is MetricType.TIMER:
+                name = f"{name}_duration_seconds"
+            
+            if len(sample) > 3 and sample[3]:
+                sample_labels = sample[3]
+                key = self._get_metric_key(name, sample_labels)
+            else:
+                sample_labels = labels
+                key = f"{name}{label_suffix}"
+            by_shard[hash(key) & _SHARD_MASK].append((metric_type, name, key, value, sample_labels))
+        
+        now = time.time()
+        for index, entries in by_shard.items():
+            shard = self._shards[index]
+            with shard.lock:
+                for metric_type, name, key, value, sample_labels in entries:
+                    if metric_type is MetricType.COUNTER:
+                        value = shard.counters[key] = shard.counters.get(key, 0.0) + value
+                    elif metric_type is MetricType.GAUGE:
+                        shard.gauges[key] = value
+                    
+                    self._append_recycled(shard, name, key, value, now, sample_labels, metric_type)
+    
+    def _append_recycled(self, shard: _Shard, name: str, key: str, value: float, timestamp: float,
+                         labels: Dict[str, str], metric_type: MetricType):
+        """Append a sample to a key's history.
+        
+        Histogram and timer samples reuse the evicted MetricValue once the
+        deque is full; counters and gauges store bare (timestamp, value)
+        tuples since their labels are fixed per key. Also keeps the key's running window aggregates in step with the deque.
+        Must be called with shard.lock held.
+        
+        Args:
+            shard: Shard that owns the key
+            name: Base metric name
+            key: Metric key
+            value: Sample value
+            timestamp: Unix time of the sample
+            labels: Labels for the sample
+            metric_type: Type of the metric; the first one recorded for a key
+                sticks, and later samples of another type are stored as that
+                type. Histograms and timers also maintain the key's
+                percentile sketch and time window.
+        """
+        dq = shard.metrics.get(key)
+        if dq is None:
+            dq = self._ensure_key_locked(shard, name, key, labels, metric_type)
+        # The history shape and sketch follow the key's stored type, not the
+        # caller's, so mixed-type use of a key can't corrupt its history
+        stored_type = shard.types[key]
+        sketch = stored_type is MetricType.HISTOGRAM or stored_type is MetricType.TIMER
+        values = shard.values[key]
+        stats = shard.stats[key]
+        stats.total += value
+        if value < stats.min_value:
+            stats.min_value = value
+        if value > stats.max_value:
+            stats.max_value = value
+        
+        if len(values) == values.maxlen:
+            evicted = values[0]
+            stats.total -= evicted
+            if evicted <= stats.min_value or evicted >= stats.max_value:
+                stats.stale = True
+            if sketch:
+                shard.sketches[key].remove(evicted)
+        values.append(value)
+        
+        if not sketch:
+            dq.append((timestamp, value))
+            return
+        
+        if len(dq) == dq.maxlen:
+            metric_value = dq.popleft()
+            metric_value.value = value
+            metric_value.timestamp = timestamp
+            metric_value.labels = labels
+        else:
+            metric_value = MetricValue(value=value, timestamp=timestamp, labels=labels)
+        dq.append(metric_value)
+        shard.sketches[key].add(value)
+        shard.windows[key].add(value, timestamp)
+    
+    def _ensure_key_locked(self, shard: _Shard, name: str, key: str, labels: Dict[str, str],
+                           metric_type: MetricType) -> deque:
+        """Create every per-key structure for a new metric key.
+        
+        Must be called with shard.lock held.
+        
+        Args:
+            shard: Shard that owns the key
+            name: Base metric name
+            key: Metric key
+            labels: Labels for the key
+            metric_type: Type of the metric
+            
+        Returns:
+            The key's (new or existing) history deque
+        """
+        dq = shard.metrics.get(key)
+        if dq is not None:
+            return dq
+        
+        dq = shard.metrics[key] = deque(maxlen=shard.max_history)
+        shard.values[key] = deque(maxlen=shard.max_history)
+        shard.types[key] = metric_type
+        shard.labels[key] = labels
+        shard.stats[key] = _WindowStats()
+        if metric_type is MetricType.HISTOGRAM or metric_type is MetricType.TIMER:
+            shard.sketches[key] = _LogHistogram()
+            shard.windows[key] = _TimeWindow(shard.window_seconds)
+        
+        with self._base_names_lock:
+            self._base_names.setdefault(name, set()).add(key)
+        return dq
     
     def get_metric_summary(self, name: str, labels: Optional[Dict[str, str]] = None) -> Optional[MetricSummary]:
         """Get summary statistics for a metric.
@@ -134,44 +668,151 @@ class MetricsCollector:
         Returns:
             MetricSummary if metric exists, None otherwise
         """
-        with self._lock:
-            key = self._get_metric_key(name, labels)
-            
-            if key not in self._metrics:
-                return None
+        key = self._get_metric_key(name, labels)
+        shard = self._shard(key)
+        
+        with shard.lock:
+            return self._summarize_locked(shard, name, key)
+    
+    def _summarize_locked(self, shard: _Shard, name: str, key: str) -> Optional[MetricSummary]:
+        """Build the summary for one metric key.
+        
+        Must be called with shard.lock held.
+        
+        Args:
+            shard: Shard that owns the key
+            name: Metric name reported in the summary
+            key: Metric key including any label suffix
+        
+        Returns:
+            MetricSummary if metric exists, None otherwise
+        """
+        if key not in shard.metrics:
+            return None
+        
+        history = shard.metrics[key]
+        
+        if not history:
+            return None
+        
+        stats = self._fresh_stats_locked(shard, key)
+        values = shard.values[key]
+        count = len(history)
+        
+        metric_type = shard.types[key]
+        distribution = metric_type is MetricType.HISTOGRAM or metric_type is MetricType.TIMER
+        last_timestamp = history[-1].timestamp if distribution else history[-1][0]
+        
+        summary = MetricSummary(
+            name=name,
+            metric_type=metric_type,
+            current_value=values[-1],
+            total_count=count,
+            min_value=stats.min_value,
+            max_value=stats.max_value,
+            avg_value=stats.total / count,
+            last_updated=datetime.fromtimestamp(last_timestamp)
+        )
+        
+        # Calculate percentiles for histograms and timers
+        if distribution and count >= 2:
+            sketch = shard.sketches.get(key)
+            if sketch is not None and sketch.count == count:
+                # Keep bin estimates inside the exact observed range
+                summary.p95_value, summary.p99_value = (
+                    min(max(value, stats.min_value), stats.max_value)
+                    for value in sketch.percentiles((95, 99))
+                )
+            else:
+                sorted_values = sorted(values)
+                summary.p95_value = self._percentile(sorted_values, 95)
+                summary.p99_value = self._percentile(sorted_values, 99)
+        
+        return summary
+    
+    @staticmethod
+    def _fresh_stats_locked(shard: _Shard, key: str) -> _WindowStats:
+        """Return a key's running aggregates, rebuilding them first if stale.
+        
+        Must be called with shard.lock held.
+        
+        Args:
+            shard: Shard that owns the key
+            key: Metric key
             
-            values = [mv.value for mv in self._metrics[key]]
+        Returns:
+            Up-to-date _WindowStats for the key
+        """
+        stats = shard.stats[key]
+        if stats.stale:
+            values = shard.values[key]
+            stats.total = math.fsum(values)
+            stats.min_value = min(values)
+            stats.max_value = max(values)
+            stats.stale = False
+        return stats
+    
+    def _eval_threshold(self, name: str, threshold_type: str) -> Optional[float]:
+        """Get the value an alert threshold on an unlabeled metric compares against.
+        
+        Reads only the needed aggregate: the time window for histograms and
+        timers (as get_window_summary does), the running aggregates otherwise.
+        No MetricSummary is built.
+        
+        Args:
+            name: Metric name
+            threshold_type: Threshold type, as passed to set_alert_threshold
             
+        Returns:
+            Value to compare against the threshold, or None if not available
+        """
+        stat = _THRESHOLD_STATS.get(threshold_type, "current")
+        shard = self._shard(name)
+        
+        with shard.lock:
+            values = shard.values.get(name)
             if not values:
                 return None
             
-            # Determine metric type
-            metric_type = MetricType.HISTOGRAM
-            if key in self._counters:
-                metric_type = MetricType.COUNTER
-            elif key in self._gauges:
-                metric_type = MetricType.GAUGE
-            elif "_duration_seconds" in name:
-                metric_type = MetricType.TIMER
-            
-            summary = MetricSummary(
-                name=name,
-                metric_type=metric_type,
-                current_value=values[-1] if values else None,
-                total_count=len(values),
-                min_value=min(values),
-                max_value=max(values),
-                avg_value=statistics.mean(values),
-                last_updated=self._metrics[key][-1].timestamp if self._metrics[key] else None
-            )
+            window = shard.windows.get(name)
+            if window is not None:
+                return window.stat(stat, time.time())
             
-            # Calculate percentiles for histograms and timers
-            if metric_type in [MetricType.HISTOGRAM, MetricType.TIMER] and len(values) >= 2:
-                sorted_values = sorted(values)
-                summary.p95_value = self._percentile(sorted_values, 95)
-                summary.p99_value = self._percentile(sorted_values, 99)
+            if stat == "current":
+                return values[-1]
+            if stat in ("p95", "p99"):
+                # Percentiles are only tracked for histograms and timers
+                return None
+            stats = self._fresh_stats_locked(shard, name)
+            if stat == "max":
+                return stats.max_value
+            if stat == "min":
+                return stats.min_value
+            return stats.total / len(values)
+    
+    def get_window_summary(self, name: str, labels: Optional[Dict[str, str]] = None) -> Optional[MetricSummary]:
+        """Get summary statistics for a histogram or timer over the time window.
+        
+        Unlike get_metric_summary, which covers the last max_history samples,
+        this covers the last window_seconds of wall-clock time.
+        
+        Args:
+            name: Metric name
+            labels: Optional labels filter
             
-            return summary
+        Returns:
+            MetricSummary (with None values if nothing was recorded inside the
+            window), or None if the metric is not a histogram or timer
+        """
+        key = self._get_metric_key(name, labels)
+        shard = self._shard(key)
+        now = time.time()
+        
+        with shard.lock:
+            window = shard.windows.get(key)
+            if window is None:
+                return None
+            return window.summarize(name, shard.types[key], now)
     
     def get_all_metrics(self) -> Dict[str, MetricSummary]:
         """Get summaries for all metrics.
@@ -179,48 +820,99 @@ class MetricsCollector:
         Returns:
             Dictionary of metric name to MetricSummary
         """
-        with self._lock:
-            summaries = {}
-            
-            # Get all unique metric names (without labels)
-            metric_names = set()
-            for key in self._metrics.keys():
-                base_name = key.split('{')[0]  # Remove label part
-                metric_names.add(base_name)
-            
-            for name in metric_names:
-                summary = self.get_metric_summary(name)
-                if summary:
-                    summaries[name] = summary
+        summaries = {}
+        
+        with self._base_names_lock:
+            metric_names = list(self._base_names)
+        
+        for name in metric_names:
+            shard = self._shard(name)
+            with shard.lock:
+                summary = self._summarize_locked(shard, name, name)
+            if summary:
+                summaries[name] = summary
+        
+        return summaries
+    
+    def get_summaries_for(self, base_name: str) -> Dict[str, MetricSummary]:
+        """Get one summary per label set recorded under a base metric name.
+        
+        Args:
+            base_name: Metric name without labels
             
-            return summaries
+        Returns:
+            Dictionary of full metric key (name plus label suffix) to MetricSummary
+        """
+        with self._base_names_lock:
+            keys = list(self._base_names.get(base_name, ()))
+        
+        summaries = {}
+        for key in keys:
+            shard = self._shard(key)
+            with shard.lock:
+                summary = self._summarize_locked(shard, base_name, key)
+            if summary:
+                summaries[key] = summary
+        
+        return summaries
     
     def clear_metrics(self):
         """Clear all collected metrics."""
-        with self._lock:
-            self._metrics.clear()
-            self._counters.clear()
-            self._gauges.clear()
+        # Index first: a key re-registered by a concurrent record is at worst
+        # an empty entry, whereas the reverse order could drop a live key
+        with self._base_names_lock:
+            self._base_names.clear()
+        for shard in self._shards:
+            with shard.lock:
+                shard.metrics.clear()
+                shard.values.clear()
+                shard.types.clear()
+                shard.labels.clear()
+                shard.counters.clear()
+                shard.gauges.clear()
+                shard.stats.clear()
+                shard.sketches.clear()
+                shard.windows.clear()
     
-    def get_metrics_since(self, since: datetime) -> Dict[str, List[MetricValue]]:
+    def get_metrics_since(self, since: Union[datetime, float]) -> Dict[str, List[MetricValue]]:
         """Get all metric values since a specific time.
         
         Args:
-            since: Timestamp to filter from
+            since: Timestamp to filter from, as a datetime or Unix time
             
         Returns:
             Dictionary of metric name to list of MetricValue
         """
-        with self._lock:
-            filtered_metrics = {}
-            
-            for key, values in self._metrics.items():
-                filtered_values = [mv for mv in values if mv.timestamp >= since]
-                if filtered_values:
-                    base_name = key.split('{')[0]
-                    filtered_metrics[base_name] = filtered_values
-            
-            return filtered_metrics
+        since_ts = since.timestamp() if isinstance(since, datetime) else since
+        
+        filtered_metrics = {}
+        
+        for shard in self._shards:
+            with shard.lock:
+                for key, values in shard.metrics.items():
+                    # History is appended in time order, so binary search
+                    # for the first sample at or after since_ts
+                    metric_type = shard.types[key]
+                    if metric_type is MetricType.HISTOGRAM or metric_type is MetricType.TIMER:
+                        start = bisect.bisect_left(values, since_ts, key=_timestamp_of)
+                        # Stored MetricValue objects are recycled on later
+                        # records, so hand out copies
+                        filtered_values = [
+                            MetricValue(mv.value, mv.timestamp, mv.labels)
+                            for mv in islice(values, start, None)
+                        ]
+                    else:
+                        start = bisect.bisect_left(values, since_ts, key=_first_item)
+                        labels = shard.labels[key]
+                        filtered_values = [
+                            MetricValue(value, timestamp, labels)
+                            for timestamp, value in islice(values, start, None)
+                        ]
+                    if filtered_values:
+                        base_name = key.split('{')[0]
+                        filtered_metrics[base_name] = filtered_values
+        
+        return filtered_metrics
     
     def _get_metric_key(self, name: str, labels: Optional[Dict[str, str]]) -> str:
         """Generate a unique key for a metric with labels.
@@ -234,10 +926,20 @@ class MetricsCollector:
         """
         if not labels:
             return name
+        return _make_key(name, frozenset(labels.items()))
+    
+    def _get_label_suffix(self, labels: Optional[Dict[str, str]]) -> str:
+        """Generate the label part of a metric key.
         
-        # Sort labels for consistent key generation
-        label_str = ','.join(f"{k}={v}" for k, v in sorted(labels.items()))
-        return f"{name}{{{label_str}}}"
+        Args:
+            labels: Optional labels
+            
+        Returns:
+            Label suffix such as "{a=1,b=2}", or an empty string without labels
+        """
+        if not labels:
+            return ""
+        return _make_key("", frozenset(labels.items()))
     
     def _percentile(self, sorted_values: List[float], percentile: float) -> float:
         """Calculate percentile value from sorted list.
@@ -277,6 +979,16 @@ class PerformanceMonitor:
         self.logger = logging.getLogger(__name__)
         self._alert_thresholds: Dict[str, Dict[str, float]] = {}
         self._alert_callbacks: Dict[str, List[Callable]] = defaultdict(list)
+        # Report tree reused by get_performance_report(reuse=True)
+        self._cached_report: Dict[str, Any] = {
+            "timestamp": None,
+            "metrics_count": 0,
+            "metrics": {},
+            "alerts": [],
+            "performance_analysis": {}
+        }
+        self._metric_dicts: Dict[str, Dict[str, Any]] = {}
+        self._report_lock = threading.Lock()
     
     def set_alert_threshold(self, metric_name: str, threshold_type: str, value: float):
         """Set alert threshold for a metric.
@@ -305,76 +1017,102 @@ class PerformanceMonitor:
     def check_alerts(self):
         """Check all metrics against their thresholds and trigger alerts."""
         for metric_name, thresholds in self._alert_thresholds.items():
-            summary = self.metrics.get_metric_summary(metric_name)
-            
-            if not summary:
-                continue
-            
             for threshold_type, threshold_value in thresholds.items():
-                current_value = self._get_threshold_value(summary, threshold_type)
+                # Histograms and timers are judged over a fixed time window so
+                # alerts don't depend on traffic volume
+                current_value = self.metrics._eval_threshold(metric_name, threshold_type)
                 
                 if current_value is not None and self._should_alert(current_value, threshold_value, threshold_type):
                     self._trigger_alert(metric_name, threshold_type, current_value, threshold_value)
     
-    def get_performance_report(self) -> Dict[str, Any]:
+    def get_performance_report(self, reuse: bool = False,
+                               all_metrics: Optional[Dict[str, MetricSummary]] = None) -> Dict[str, Any]:
         """Generate comprehensive performance report.
         
+        Args:
+            reuse: Repopulate one cached report tree in place instead of
+                building a new one. Meant for frequent polling; the returned
+                report is a copy taken under the report lock, but the
+                per-metric dicts under "metrics" are shared and refilled by
+                the next reuse=True call, so callers that keep or hand on
+                the report must copy them or use the default.
+            all_metrics: Summaries already fetched with get_all_metrics() by
+                the caller, to avoid summarizing every metric again
+        
         Returns:
             Dictionary containing performance metrics and analysis
         """
-        all_metrics = self.metrics.get_all_metrics()
+        if all_metrics is None:
+            all_metrics = self.metrics.get_all_metrics()
         
-        report = {
-            "timestamp": datetime.now().isoformat(),
-            "metrics_count": len(all_metrics),
-            "metrics": {},
-            "alerts": [],
-            "performance_analysis": {}
-        }
-        
-        # Add metric summaries
-        for name, summary in all_metrics.items():
-            report["metrics"][name] = {
-                "type": summary.metric_type.value,
-                "current_value": summary.current_value,
-                "total_count": summary.total_count,
-                "min_value": summary.min_value,
-                "max_value": summary.max_value,
-                "avg_value": summary.avg_value,
-                "p95_value": summary.p95_value,
-                "p99_value": summary.p99_value,
-                "last_updated": summary.last_updated.isoformat() if summary.last_updated else None
+        if not reuse:
+            report = {
+                "timestamp": datetime.now().isoformat(),
+                "metrics_count": len(all_metrics),
+                "metrics": {},
+                "alerts": [],
+                "performance_analysis": {}
             }
+            
+            # Add metric summaries
+            for name, summary in all_metrics.items():
+                report["metrics"][name] = self._fill_metric_dict({}, summary)
+            
+            # Check for performance issues
+            self._analyze_performance(report, all_metrics)
+            
+            return report
         
-        # Check for performance issues
-        self._analyze_performance(report, all_metrics)
-        
-        return report
+        with self._report_lock:
+            report = self._cached_report
+            report["timestamp"] = datetime.now().isoformat()
+            report["metrics_count"] = len(all_metrics)
+            report["metrics"].clear()
+            report["alerts"].clear()
+            report["performance_analysis"].clear()
+            
+            metric_dicts = self._metric_dicts
+            for stale in metric_dicts.keys() - all_metrics.keys():
+                del metric_dicts[stale]
+            
+            for name, summary in all_metrics.items():
+                metric_dict = metric_dicts.get(name)
+                if metric_dict is None:
+                    metric_dict = metric_dicts[name] = {}
+                report["metrics"][name] = self._fill_metric_dict(metric_dict, summary)
+            
+            self._analyze_performance(report, all_metrics)
+            
+            # Copy the top-level containers while still holding the lock so
+            # another reuse=True call cannot clear them under the caller
+            return {
+                **report,
+                "metrics": dict(report["metrics"]),
+                "alerts": list(report["alerts"]),
+                "performance_analysis": dict(report["performance_analysis"])
+            }
     
-    def _get_threshold_value(self, summary: MetricSummary, threshold_type: str) -> Optional[float]:
-        """Get the appropriate value from metric summary for threshold comparison.
+    @staticmethod
+    def _fill_metric_dict(metric_dict: Dict[str, Any], summary: MetricSummary) -> Dict[str, Any]:
+        """Write a metric summary's report fields into a dict.
         
         Args:
-            summary: MetricSummary to extract value from
-            threshold_type: Type of threshold
+            metric_dict: Dict to populate (modified in place)
+            summary: Summary to read from
             
         Returns:
-            Value to compare against threshold, or None if not available
-        """
-        if threshold_type == "max":
-            return summary.max_value
-        elif threshold_type == "min":
-            return summary.min_value
-        elif threshold_type == "avg_max":
-            return summary.avg_value
-        elif threshold_type == "p95_max":
-            return summary.p95_value
-        elif threshold_type == "p99_max":
-            return summary.p99_value
-        elif threshold_type == "current_max":
-            return summary.current_value
-        else:
-            return summary.current_value
+            The populated dict
+        """
+        metric_dict["type"] = summary.metric_type.value
+        metric_dict["current_value"] = summary.current_value
+        metric_dict["total_count"] = summary.total_count
+        metric_dict["min_value"] = summary.min_value
+        metric_dict["max_value"] = summary.max_value
+        metric_dict["avg_value"] = summary.avg_value
+        metric_dict["p95_value"] = summary.p95_value
+        metric_dict["p99_value"] = summary.p99_value
+        metric_dict["last_updated"] = summary.last_updated.isoformat() if summary.last_updated else None
+        return metric_dict
     
     def _should_alert(self, current_value: float, threshold_value: float, threshold_type: str) -> bool:
         """Determine if an alert should be triggered.
@@ -432,26 +1170,31 @@ class PerformanceMonitor:
         """
         analysis = report["performance_analysis"]
         
-        # Analyze request processing times
+        # Single pass: dispatch on metric type first so most metrics are
+        # skipped after one comparison
         for name, summary in metrics.items():
-            if "_duration_seconds" in name and summary.metric_type == MetricType.TIMER:
-                if summary.avg_value and summary.avg_value > 5.0:  # > 5 seconds average
+            metric_type = summary.metric_type
+            
+            # Analyze request processing times
+            if metric_type is MetricType.TIMER and "_duration_seconds" in name:
+                avg_value = summary.avg_value
+                if avg_value and avg_value > 5.0:  # > 5 seconds average
                     analysis[f"{name}_slow"] = {
                         "issue": "Slow processing time",
-                        "avg_duration": summary.avg_value,
+                        "avg_duration": avg_value,
                         "recommendation": "Consider optimizing the operation or increasing resources"
                     }
                 
-                if summary.p99_value and summary.p99_value > 30.0:  # > 30 seconds p99
+                p99_value = summary.p99_value
+                if p99_value and p99_value > 30.0:  # > 30 seconds p99
                     analysis[f"{name}_outliers"] = {
                         "issue": "High latency outliers",
-                        "p99_duration": summary.p99_value,
+                        "p99_duration": p99_value,
                         "recommendation": "Investigate timeout handling and resource constraints"
                     }
-        
-        # Analyze error rates
-        for name, summary in metrics.items():
-            if "error" in name and summary.metric_type == MetricType.COUNTER:
+            
+            # Analyze error rates
+            elif metric_type is MetricType.COUNTER and "error" in name:
                 if summary.current_value and summary.current_value > 10:  # > 10 errors
                     analysis[f"{name}_high"] = {
                         "issue": "High error count",
@@ -475,17 +1218,19 @@ class TimerContext:
         self.metrics = metrics_collector
         self.metric_name = metric_name
         self.labels = labels
-        self.start_time = None
+        # Monotonic nanoseconds from time.perf_counter_ns(); integer math keeps
+        # sub-microsecond precision that epoch floats lose
+        self.start_time: Optional[int] = None
     
     def __enter__(self):
         """Start timing."""
-        self.start_time = time.time()
+        self.start_time = time.perf_counter_ns()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Stop timing and record duration."""
         if self.start_time is not None:
-            duration = time.time() - self.start_time
+            duration = (time.perf_counter_ns() - self.start_time) / 1e9
             self.metrics.record_timer(self.metric_name, duration, self.labels)
 
 
@@ -525,9 +1270,20 @@ def timer(metric_name: str, labels: Optional[Dict[str, str]] = None):
         Decorator function
     """
     def decorator(func):
+        # Timing is inlined rather than going through TimerContext so each call
+        # only costs two clock reads and the record
+        collector: Optional[MetricsCollector] = None
+        
+        @wraps(func)
         def wrapper(*args, **kwargs):
-            with TimerContext(get_metrics_collector(), metric_name, labels):
+            nonlocal collector
+            if collector is None:
+                collector = get_metrics_collector()
+            start = time.perf_counter_ns()
+            try:
                 return func(*args, **kwargs)
+            finally:
+                collector.record_timer(metric_name, (time.perf_counter_ns() - start) / 1e9, labels)
         return wrapper
     return decorator
 
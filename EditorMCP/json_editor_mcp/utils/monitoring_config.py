@@ -1,20 +1,217 @@
 """Monitoring and metrics configuration for JSON Editor MCP Tool."""
 
+import asyncio
+import json
 import logging
+import queue
 import threading
 import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Callable
+from enum import Enum
+from itertools import chain
+from types import SimpleNamespace
+from typing import Dict, Any, Optional, List, Callable, Tuple
 from pathlib import Path
 
 from .logging_config import setup_logging, get_logger, ErrorTrackingHandler
-from .metrics import MetricsCollector, PerformanceMonitor, setup_default_alerts
+from .metrics import MetricsCollector, MetricSummary, PerformanceMonitor, setup_default_alerts
 from .llm_monitoring import LLMPerformanceMonitor, get_llm_monitor
 from ..config.models import ServerConfig
 
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    _HAS_ORJSON = False
+
+
+def _metric_summary_dict(summary: MetricSummary) -> Dict[str, Any]:
+    """Convert a metric summary to its report representation."""
+    return {
+        "type": summary.metric_type.value,
+        "current_value": summary.current_value,
+        "total_count": summary.total_count,
+        "min_value": summary.min_value,
+        "max_value": summary.max_value,
+        "avg_value": summary.avg_value,
+        "p95_value": summary.p95_value,
+        "p99_value": summary.p99_value,
+        "last_updated": summary.last_updated.isoformat() if summary.last_updated else None
+    }
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize report values the JSON encoders don't handle natively."""
+    if isinstance(obj, MetricSummary):
+        return _metric_summary_dict(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    return str(obj)
+
+
+def to_json(report: Dict[str, Any]) -> str:
+    """Serialize a monitoring report, using orjson when available.
+    
+    Accepts raw reports (see MonitoringManager.get_metrics_report), so metric
+    summaries are converted during encoding rather than into intermediate dicts.
+    
+    Args:
+        report: Report to serialize
+        
+    Returns:
+        JSON string
+    """
+    if _HAS_ORJSON:
+        try:
+            return orjson.dumps(
+                report, default=_json_default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+            ).decode("utf-8")
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(report, default=_json_default)
+
+
+# Background monitoring cadence
+_ALERT_CHECK_INTERVAL_SECONDS = 30.0
+_REPORT_INTERVAL_SECONDS = 300.0
+
+# Errors recorded since the last alert check that make record_request_complete
+# ask the monitoring loop for an early check
+_ALERT_HINT_ERROR_THRESHOLD = 10
+
+# Events posted to the monitoring loop's queue
+_ALERT_HINT = object()
+_MONITOR_STOP = object()
+
+
+# Canonical (label dict, label key) pairs for the few (operation, status,
+# error_type) combinations seen by the request hooks; shared between calls, so
+# never mutate them
+_LABELS_CACHE: Dict[Tuple[str, Optional[str], Optional[str]], Tuple[Dict[str, str], tuple]] = {}
+
+
+def _labels_key(labels: Dict[str, str]) -> tuple:
+    """Build the hashable, order-independent counter key for a label dict."""
+    return tuple(sorted(labels.items()))
+
+
+def _canonical_labels(operation: str, status: Optional[str],
+                      error_type: Optional[str]) -> Tuple[Dict[str, str], tuple]:
+    """Return the shared labels for a request outcome.
+    
+    Args:
+        operation: Operation name
+        status: Request status, or None to leave it out
+        error_type: Error type, or None to leave it out
+        
+    Returns:
+        Cached (label dictionary, label key) pair (treat as read-only); the
+        key equals _labels_key() of the dictionary
+    """
+    cache_key = (operation, status, error_type)
+    cached = _LABELS_CACHE.get(cache_key)
+    if cached is None:
+        labels = {"operation": operation}
+        if status is not None:
+            labels["status"] = status
+        if error_type:
+            labels["error_type"] = error_type
+        # Fixed schema, so the key is written in sorted order without sorting
+        label_key = (("operation", operation),)
+        if error_type:
+            label_key = (("error_type", error_type),) + label_key
+        if status is not None:
+            label_key += (("status", status),)
+        cached = _LABELS_CACHE.setdefault(cache_key, (labels, label_key))
+    return cached
+
+
+class _ShardedCounter:
+    """Per-thread counter totals merged into a MetricsCollector on demand.
+    
+    Each thread only ever writes its own dict, so recording takes no lock
+    and threads don't contend on the collector; under the GIL the owner's
+    single-slot updates and the flusher's dict.copy() are atomic. Totals are
+    cumulative per thread and flush() pushes the growth since the last flush.
+    Slots of threads that have exited are dropped once flushed, so pooled or
+    short-lived request threads don't accumulate state.
+    """
+    
+    def __init__(self, collector: MetricsCollector):
+        self._collector = collector
+        self._local = threading.local()
+        # One (thread, totals, flushed) slot per live thread that has recorded
+        self._thread_totals: List[Tuple[threading.Thread, Dict[tuple, float], Dict[tuple, float]]] = []
+        self._register_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+    
+    def add(self, name: str, label_key: tuple, delta: float = 1.0):
+        """Add to a counter from the calling thread.
+        
+        Args:
+            name: Counter name
+            label_key: Labels as built by _labels_key() or _canonical_labels()
+            delta: Amount to add
+        """
+        totals = getattr(self._local, "totals", None)
+        if totals is None:
+            totals = self._local.totals = {}
+            with self._register_lock:
+                self._thread_totals.append((threading.current_thread(), totals, {}))
+        
+        key = (name, label_key)
+        totals[key] = totals.get(key, 0.0) + delta
+    
+    def flush(self):
+        """Push counter growth since the last flush into the collector.
+        
+        Growth is aggregated per (name, labels) across threads and written
+        with a single record_batch() call, so each collector shard lock is
+        taken once per flush.
+        """
+        with self._flush_lock:
+            with self._register_lock:
+                thread_totals = list(self._thread_totals)
+            
+            merged: Dict[tuple, float] = {}
+            finished = []
+            for slot in thread_totals:
+                thread, totals, flushed = slot
+                # Checked before reading: a dead thread's totals are final
+                if not thread.is_alive():
+                    finished.append(slot)
+                for key, total in totals.copy().items():
+                    delta = total - flushed.get(key, 0.0)
+                    if delta:
+                        flushed[key] = total
+                        merged[key] = merged.get(key, 0.0) + delta
+            
+            if merged:
+                self._collector.record_batch([
+                    ("counter", name, delta, dict(label_items))
+                    for (name, label_items), delta in merged.items()
+                ])
+            
+            if finished:
+                with self._register_lock:
+                    self._thread_totals = [
+                        slot for slot in self._thread_totals
+                        if not any(slot is done for done in finished)
+                    ]
+
 
 class MonitoringManager:
-    """Central manager for all monitoring and metrics collection."""
+    """Central manager for all monitoring and metrics collection.
+    
+    The metrics components are created on first use. With monitoring enabled
+    that happens during construction; with it disabled the record_* hooks
+    are no-ops and reports are built from an empty snapshot, so the
+    components only exist if one of the properties below is read directly.
+    """
     
     def __init__(self, config: ServerConfig):
         """Initialize monitoring manager with configuration.
@@ -24,28 +221,90 @@ class MonitoringManager:
         """
         self.config = config
         self.logger = get_logger(__name__)
+        self._enabled = bool(config.monitoring_config and config.monitoring_config.enabled)
         
-        # Initialize components
-        self.metrics_collector = MetricsCollector()
-        self.performance_monitor = PerformanceMonitor(self.metrics_collector)
-        self.llm_monitor = LLMPerformanceMonitor(self.metrics_collector)
         self.error_tracker: Optional[ErrorTrackingHandler] = None
         
+        # Metrics components, created by _create_components
+        self._components: Optional[SimpleNamespace] = None
+        self._components_lock = threading.Lock()
+        if self._enabled:
+            # Create them up front so request threads never race to
+            self._create_components()
+        
         # Monitoring state
         self._monitoring_active = False
         self._monitoring_thread: Optional[threading.Thread] = None
+        self._monitoring_task: Optional["asyncio.Task[None]"] = None
+        # Event loop running _monitoring_task; None while monitoring runs in
+        # (or would fall back to) the thread
+        self._monitoring_event_loop: Optional[asyncio.AbstractEventLoop] = None
         self._shutdown_event = threading.Event()
+        # queue.SimpleQueue for the thread, asyncio.Queue for the task
+        self._monitor_queue: Any = queue.SimpleQueue()
+        # Approximate (unlocked) count of errors since the last alert check
+        self._errors_since_check = 0
+        # Set once an alert hint is posted; cleared by the next alert check
+        self._alert_hint_posted = False
         
-        # Alert callbacks
-        self._alert_callbacks: List[Callable[[str, Dict[str, Any]], None]] = []
+        # Alert callbacks; copy-on-write so dispatch iterates a snapshot unlocked
+        self._alert_callbacks: Tuple[Callable[[str, Dict[str, Any]], None], ...] = ()
+        self._alert_callbacks_lock = threading.Lock()
         
         # Setup monitoring
         self._setup_logging()
         self._setup_metrics()
         self._setup_alerts()
     
+    def _create_components(self) -> SimpleNamespace:
+        """Create the metrics components, once.
+        
+        Creation is serialized so concurrent first uses (e.g. two report
+        calls with monitoring disabled) share one set of components.
+        
+        Returns:
+            Namespace with metrics_collector, performance_monitor,
+            llm_monitor and request_counters
+        """
+        with self._components_lock:
+            if self._components is None:
+                collector = MetricsCollector()
+                self._components = SimpleNamespace(
+                    metrics_collector=collector,
+                    performance_monitor=PerformanceMonitor(collector),
+                    llm_monitor=LLMPerformanceMonitor(collector),
+                    # Recorded per thread and merged into the collector
+                    # whenever metrics are read
+                    request_counters=_ShardedCounter(collector)
+                )
+            return self._components
+    
+    @property
+    def metrics_collector(self) -> MetricsCollector:
+        """Metrics collector shared by all monitoring components."""
+        return (self._components or self._create_components()).metrics_collector
+    
+    @property
+    def performance_monitor(self) -> PerformanceMonitor:
+        """Performance monitor over metrics_collector."""
+        return (self._components or self._create_components()).performance_monitor
+    
+    @property
+    def llm_monitor(self) -> LLMPerformanceMonitor:
+        """LLM performance monitor recording into metrics_collector."""
+        return (self._components or self._create_components()).llm_monitor
+    
+    @property
+    def _request_counters(self) -> _ShardedCounter:
+        """Per-thread request counters merged into metrics_collector."""
+        return (self._components or self._create_components()).request_counters
+    
     def start_monitoring(self):
-        """Start background monitoring processes."""
+        """Start background monitoring processes.
+        
+        Called from a running event loop, monitoring runs as a task on that
+        loop; otherwise it falls back to a daemon thread.
+        """
         if self._monitoring_active:
             self.logger.warning("Monitoring is already active")
             return
@@ -53,35 +312,118 @@ class MonitoringManager:
         self._monitoring_active = True
         self._shutdown_event.clear()
         
-        # Start monitoring thread
-        self._monitoring_thread = threading.Thread(
-            target=self._monitoring_loop,
-            name="MonitoringThread",
-            daemon=True
-        )
-        self._monitoring_thread.start()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        
+        # Fresh queue so a stop event left by the previous loop isn't seen
+        if loop is not None:
+            self._monitor_queue = asyncio.Queue()
+            self._monitoring_event_loop = loop
+            self._monitoring_task = loop.create_task(
+                self._monitoring_loop_async(self._monitor_queue),
+                name="MonitoringTask"
+            )
+        else:
+            self._monitor_queue = queue.SimpleQueue()
+            self._monitoring_event_loop = None
+            self._monitoring_thread = threading.Thread(
+                target=self._monitoring_loop,
+                args=(self._monitor_queue,),
+                name="MonitoringThread",
+                daemon=True
+            )
+            self._monitoring_thread.start()
         
         self.logger.info("Started monitoring and metrics collection")
     
     def stop_monitoring(self):
-        """Stop background monitoring processes."""
+        """Stop background monitoring processes.
+        
+        A monitoring thread is joined; a monitoring task can't be awaited from
+        here and finishes on its loop's next iteration (or is cancelled when
+        the loop shuts down).
+        """
         if not self._monitoring_active:
             return
         
         self._monitoring_active = False
         self._shutdown_event.set()
+        try:
+            self._post_monitor_event(_MONITOR_STOP)
+        except RuntimeError:
+            # The task's event loop is already closed, taking the task with it
+            pass
+        self._monitoring_task = None
         
         if self._monitoring_thread and self._monitoring_thread.is_alive():
             self._monitoring_thread.join(timeout=5.0)
         
         self.logger.info("Stopped monitoring and metrics collection")
     
-    def get_health_status(self) -> Dict[str, Any]:
+    def _post_monitor_event(self, event: object):
+        """Post an event to the monitoring thread or task from any thread."""
+        loop = self._monitoring_event_loop
+        if loop is None:
+            self._monitor_queue.put(event)
+        else:
+            loop.call_soon_threadsafe(self._monitor_queue.put_nowait, event)
+    
+    def _collect_snapshot(self, reuse_performance: bool = False) -> SimpleNamespace:
+        """Gather the collector state shared by the health and metrics reports.
+        
+        Building one snapshot and passing it to several report methods reads
+        each source once instead of once per report.
+        
+        Args:
+            reuse_performance: Build the performance report in the monitor's
+                reusable cached tree (see PerformanceMonitor.get_performance_report);
+                only for snapshots that are discarded after a single report
+        
+        Returns:
+            Namespace with all_metrics, llm_stats, llm_report, error_summary,
+            performance_report and health (filled in by get_health_status);
+            the metrics sections are empty when monitoring is disabled
+        """
+        if not self._enabled:
+            # Nothing is recorded, so don't create components just to report
+            return SimpleNamespace(
+                all_metrics={},
+                llm_stats={},
+                llm_report={},
+                error_summary=self.error_tracker.get_error_summary() if self.error_tracker else None,
+                performance_report={},
+                health=None
+            )
+        
+        self._request_counters.flush()
+        all_metrics = self.metrics_collector.get_all_metrics()
+        return SimpleNamespace(
+            all_metrics=all_metrics,
+            llm_stats=self.llm_monitor.get_all_provider_stats(),
+            llm_report=self.llm_monitor.get_performance_report(),
+            error_summary=self.error_tracker.get_error_summary() if self.error_tracker else None,
+            performance_report=self.performance_monitor.get_performance_report(
+                reuse=reuse_performance, all_metrics=all_metrics
+            ),
+            health=None
+        )
+    
+    def get_health_status(self, snapshot: Optional[SimpleNamespace] = None) -> Dict[str, Any]:
         """Get comprehensive health status of the system.
         
+        Args:
+            snapshot: Result of _collect_snapshot() shared with other reports;
+                collected here when omitted. The health status is stored on
+                the snapshot, so later calls with it return the same dict.
+        
         Returns:
             Dictionary containing health status information
         """
+        if snapshot is not None and snapshot.health is not None:
+            return snapshot.health
+        
         health = {
             "timestamp": datetime.now().isoformat(),
             "status": "healthy",
@@ -91,8 +433,11 @@ class MonitoringManager:
         }
         
         try:
+            if snapshot is None:
+                snapshot = self._collect_snapshot(reuse_performance=True)
+            
             # Check metrics collector
-            metrics_summary = self.metrics_collector.get_all_metrics()
+            metrics_summary = snapshot.all_metrics
             health["components"]["metrics_collector"] = {
                 "status": "healthy",
                 "metrics_count": len(metrics_summary)
@@ -107,7 +452,7 @@ class MonitoringManager:
             }
             
             # Check LLM monitor
-            llm_stats = self.llm_monitor.get_all_provider_stats()
+            llm_stats = snapshot.llm_stats
             health["components"]["llm_monitor"] = {
                 "status": "healthy",
                 "providers_count": len(llm_stats),
@@ -115,19 +460,19 @@ class MonitoringManager:
             }
             
             # Check error tracker
-            if self.error_tracker:
-                error_summary = self.error_tracker.get_error_summary()
+            error_alerts = ()
+            error_summary = snapshot.error_summary
+            if error_summary is not None:
+                total_errors = sum(error_summary["total_errors_by_logger"].values())
                 health["components"]["error_tracker"] = {
                     "status": "healthy",
-                    "total_errors": sum(error_summary["total_errors_by_logger"].values()),
-                    "recent_errors": len(error_summary["recent_error_count"])
+                    "total_errors": total_errors,
+                    "recent_errors": error_summary["recent_error_count"]
                 }
                 
-                # Add alerts for high error rates
-                total_errors = sum(error_summary["total_errors_by_logger"].values())
+                # Alert on high error rates
                 if total_errors > 50:
-                    health["alerts"].append(f"High error count: {total_errors} total errors")
-                    health["status"] = "degraded"
+                    error_alerts = (f"High error count: {total_errors} total errors",)
             
             # Check monitoring thread
             health["components"]["monitoring_thread"] = {
@@ -135,30 +480,36 @@ class MonitoringManager:
                 "active": self._monitoring_active
             }
             
-            # Performance checks
-            performance_report = self.performance_monitor.get_performance_report()
-            if performance_report.get("alerts"):
-                health["alerts"].extend(performance_report["alerts"])
-                health["status"] = "degraded"
-            
-            # LLM performance checks
-            llm_report = self.llm_monitor.get_performance_report()
-            if llm_report.get("alerts"):
-                health["alerts"].extend(llm_report["alerts"])
-                health["status"] = "degraded"
+            # Error, performance and LLM performance alerts, gathered in one pass
+            health["alerts"] = list(chain(
+                error_alerts,
+                snapshot.performance_report.get("alerts", ()),
+                snapshot.llm_report.get("alerts", ())
+            ))
+            health["status"] = "degraded" if health["alerts"] else "healthy"
             
         except Exception as e:
             health["status"] = "unhealthy"
             health["error"] = str(e)
             self.logger.error(f"Error getting health status: {e}")
         
+        if snapshot is not None:
+            snapshot.health = health
         return health
     
-    def get_metrics_report(self, include_history: bool = False) -> Dict[str, Any]:
+    def get_metrics_report(self, include_history: bool = False,
+                           snapshot: Optional[SimpleNamespace] = None,
+                           raw: bool = False) -> Dict[str, Any]:
         """Get comprehensive metrics report.
         
+        All sections are built from one _collect_snapshot() of the collector.
+        
         Args:
             include_history: Whether to include historical data
+            snapshot: Result of _collect_snapshot() shared with other reports;
+                collected here when omitted
+            raw: Keep general_metrics as MetricSummary objects instead of
+                dicts; serialize such reports with to_json()
             
         Returns:
             Dictionary containing metrics report
@@ -172,35 +523,31 @@ class MonitoringManager:
         }
         
         try:
+            if snapshot is None:
+                snapshot = self._collect_snapshot()
+            
             # General metrics
-            all_metrics = self.metrics_collector.get_all_metrics()
-            report["general_metrics"] = {
-                name: {
-                    "type": summary.metric_type.value,
-                    "current_value": summary.current_value,
-                    "total_count": summary.total_count,
-                    "min_value": summary.min_value,
-                    "max_value": summary.max_value,
-                    "avg_value": summary.avg_value,
-                    "p95_value": summary.p95_value,
-                    "p99_value": summary.p99_value,
-                    "last_updated": summary.last_updated.isoformat() if summary.last_updated else None
+            all_metrics = snapshot.all_metrics
+            if raw:
+                report["general_metrics"] = all_metrics
+            else:
+                report["general_metrics"] = {
+                    name: _metric_summary_dict(summary)
+                    for name, summary in all_metrics.items()
                 }
-                for name, summary in all_metrics.items()
-            }
             
             # LLM performance
-            report["llm_performance"] = self.llm_monitor.get_performance_report()
+            report["llm_performance"] = snapshot.llm_report
             
             # Error tracking
-            if self.error_tracker:
-                report["error_tracking"] = self.error_tracker.get_error_summary()
+            if snapshot.error_summary is not None:
+                report["error_tracking"] = snapshot.error_summary
             
             # System health
-            report["system_health"] = self.get_health_status()
+            report["system_health"] = self.get_health_status(snapshot)
             
             # Performance analysis
-            report["performance_analysis"] = self.performance_monitor.get_performance_report()
+            report["performance_analysis"] = snapshot.performance_report
             
         except Exception as e:
             report["error"] = str(e)
@@ -215,53 +562,83 @@ class MonitoringManager:
             callback: Function to call when alerts are triggered
                      Signature: callback(alert_type, alert_data)
         """
-        self._alert_callbacks.append(callback)
+        with self._alert_callbacks_lock:
+            self._alert_callbacks = (*self._alert_callbacks, callback)
     
-    def record_request_start(self, operation: str, request_id: str, **labels):
+    def record_request_start(self, operation: str, request_id: str, **labels) -> Optional[Tuple[str, int]]:
         """Record the start of a request operation.
         
         Args:
             operation: Operation name (e.g., 'preview', 'apply')
-            request_id: Unique request identifier
+            request_id: Unique request identifier; logged for tracing but not
+                used as a metric label, which would make every request its
+                own series
             **labels: Additional labels for the metric
+            
+        Returns:
+            Opaque request token to pass to record_request_complete, or None
+            when monitoring is disabled. The start time travels with the
+            caller instead of a shared map, so nothing needs cleaning up if
+            the request never completes.
         """
-        labels.update({"operation": operation, "request_id": request_id})
-        self.metrics_collector.increment_counter("requests_started_total", 1.0, labels)
-        
-        # Store start time for duration calculation
-        if not hasattr(self, '_request_start_times'):
-            self._request_start_times = {}
-        self._request_start_times[request_id] = time.time()
+        if not self._enabled:
+            return None
+        
+        if labels:
+            labels["operation"] = operation
+            label_key = _labels_key(labels)
+        else:
+            label_key = _canonical_labels(operation, None, None)[1]
+        self._request_counters.add("requests_started_total", label_key)
+        self.logger.debug("Request started", extra={"operation": operation, "request_id": request_id})
+        
+        return (operation, time.monotonic_ns())
     
-    def record_request_complete(self, operation: str, request_id: str, 
+    def record_request_complete(self, operation: str, request_token: Optional[Tuple[str, int]],
                               status: str, error_type: Optional[str] = None, **labels):
         """Record the completion of a request operation.
         
         Args:
             operation: Operation name
-            request_id: Unique request identifier
+            request_token: Token returned by record_request_start, or None if
+                the start was not recorded (no duration is recorded then)
             status: Request status ('success', 'error', etc.)
             error_type: Type of error if status is 'error'
             **labels: Additional labels for the metric
         """
-        labels.update({"operation": operation, "status": status})
-        if error_type:
-            labels["error_type"] = error_type
+        if not self._enabled:
+            return
+        
+        if labels:
+            labels.update({"operation": operation, "status": status})
+            if error_type:
+                labels["error_type"] = error_type
+            label_key = _labels_key(labels)
+        else:
+            labels, label_key = _canonical_labels(operation, status, error_type)
         
-        self.metrics_collector.increment_counter("requests_completed_total", 1.0, labels)
+        self._request_counters.add("requests_completed_total", label_key)
         
-        # Record duration if we have start time
-        if hasattr(self, '_request_start_times') and request_id in self._request_start_times:
-            duration = time.time() - self._request_start_times[request_id]
+        # Record duration from the token's monotonic start time
+        if request_token is not None:
+            duration = (time.monotonic_ns() - request_token[1]) / 1e9
             self.metrics_collector.record_timer(f"{operation}_request_duration_seconds", duration, labels)
-            del self._request_start_times[request_id]
         
         # Record errors
         if status == "error":
-            error_labels = {"operation": operation}
-            if error_type:
-                error_labels["error_type"] = error_type
-            self.metrics_collector.increment_counter("request_errors_total", 1.0, error_labels)
+            self._request_counters.add("request_errors_total",
+                                       _canonical_labels(operation, None, error_type)[1])
+            
+            # Ask for an early alert check on error bursts instead of waiting
+            # out the polling interval; posted once per check cycle
+            self._errors_since_check += 1
+            if (self._errors_since_check >= _ALERT_HINT_ERROR_THRESHOLD
+                    and not self._alert_hint_posted and self._monitoring_active):
+                self._alert_hint_posted = True
+                try:
+                    self._post_monitor_event(_ALERT_HINT)
+                except RuntimeError:
+                    pass
     
     def record_llm_request(self, provider: str, model: str, request_id: str, 
                           prompt_tokens: Optional[int] = None):
@@ -274,8 +651,11 @@ class MonitoringManager:
             prompt_tokens: Number of prompt tokens
             
         Returns:
-            LLMRequestTracker context manager
+            LLMRequestMetrics for the started request, or None when
+            monitoring is disabled
         """
+        if not self._enabled:
+            return None
         return self.llm_monitor.start_request(provider, model, request_id, prompt_tokens)
     
     def record_document_processing(self, operation: str, document_size: int, 
@@ -288,6 +668,9 @@ class MonitoringManager:
             processing_time: Processing time in seconds
             changes_count: Number of changes processed
         """
+        if not self._enabled:
+            return
+        
         labels = {"operation": operation}
         
         self.metrics_collector.record_histogram("document_size_bytes", document_size, labels)
@@ -339,35 +722,109 @@ class MonitoringManager:
                 "request_errors_total", "current_max", 25.0
             )
     
-    def _monitoring_loop(self):
-        """Background monitoring loop."""
+    def _monitoring_loop(self, monitor_queue: "queue.SimpleQueue[object]"):
+        """Background monitoring loop for the monitoring thread.
+        
+        Sleeps on the monitoring queue until the next deadline or an event:
+        alert hints from record_request_complete trigger an early alert check,
+        and all events pending at a wake-up are coalesced into one pass.
+        
+        Args:
+            monitor_queue: Queue events are posted to
+        """
         self.logger.debug("Started monitoring loop")
         
+        # Monotonic deadlines, so clock steps can't skip or repeat a run and
+        # the thread only wakes when something is due
+        now = time.monotonic()
+        deadlines = (now, now + _REPORT_INTERVAL_SECONDS)
+        
         while not self._shutdown_event.is_set():
+            events = []
             try:
-                # Check alerts every 30 seconds
+                events.append(monitor_queue.get(timeout=max(min(deadlines) - time.monotonic(), 0.0)))
+                while True:
+                    events.append(monitor_queue.get_nowait())
+            except queue.Empty:
+                pass
+            
+            if _MONITOR_STOP in events or self._shutdown_event.is_set():
+                break
+            
+            deadlines = self._run_due_monitoring(events, *deadlines)
+        
+        self.logger.debug("Monitoring loop stopped")
+    
+    async def _monitoring_loop_async(self, monitor_queue: "asyncio.Queue[object]"):
+        """Background monitoring loop for the monitoring task.
+        
+        Same schedule and event handling as _monitoring_loop, waiting on the
+        event loop instead of a thread of its own.
+        
+        Args:
+            monitor_queue: Queue events are posted to
+        """
+        self.logger.debug("Started monitoring task")
+        
+        now = time.monotonic()
+        deadlines = (now, now + _REPORT_INTERVAL_SECONDS)
+        
+        while not self._shutdown_event.is_set():
+            events = []
+            try:
+                events.append(await asyncio.wait_for(
+                    monitor_queue.get(), timeout=max(min(deadlines) - time.monotonic(), 0.0)
+                ))
+            except asyncio.TimeoutError:
+                pass
+            while not monitor_queue.empty():
+                events.append(monitor_queue.get_nowait())
+            
+            if _MONITOR_STOP in events or self._shutdown_event.is_set():
+                break
+            
+            deadlines = self._run_due_monitoring(events, *deadlines)
+        
+        self.logger.debug("Monitoring task stopped")
+    
+    def _run_due_monitoring(self, events: List[object], next_alert_check: float,
+                            next_report: float) -> Tuple[float, float]:
+        """Run the monitoring work that is due or was requested by events.
+        
+        Args:
+            events: Events received since the previous pass
+            next_alert_check: Monotonic deadline of the next alert check
+            next_report: Monotonic deadline of the next periodic report
+            
+        Returns:
+            Updated (next_alert_check, next_report) deadlines
+        """
+        now = time.monotonic()
+        try:
+            if now >= next_alert_check or _ALERT_HINT in events:
+                self._errors_since_check = 0
+                self._alert_hint_posted = False
+                self._request_counters.flush()
                 self.performance_monitor.check_alerts()
+                next_alert_check = now + _ALERT_CHECK_INTERVAL_SECONDS
+            
+            if now >= next_report:
+                self._generate_periodic_report()
+                next_report = now + _REPORT_INTERVAL_SECONDS
                 
-                # Generate periodic reports every 5 minutes
-                if int(time.time()) % 300 == 0:  # Every 5 minutes
-                    self._generate_periodic_report()
-                
-                # Sleep for 30 seconds
-                if self._shutdown_event.wait(30):
-                    break
-                    
-            except Exception as e:
-                self.logger.error(f"Error in monitoring loop: {e}")
-                # Continue monitoring even if there's an error
-                if self._shutdown_event.wait(30):
-                    break
+        except Exception as e:
+            self.logger.error(f"Error in monitoring loop: {e}")
+            # Continue monitoring even if there's an error
+            next_alert_check = now + _ALERT_CHECK_INTERVAL_SECONDS
+            next_report = max(next_report, next_alert_check)
         
-        self.logger.debug("Monitoring loop stopped")
+        return next_alert_check, next_report
     
     def _generate_periodic_report(self):
         """Generate and log periodic monitoring report."""
         try:
-            report = self.get_metrics_report()
+            # Only counts are read here, so skip the per-metric dict conversion
+            report = self.get_metrics_report(raw=True)
             
             # Log summary statistics
             general_metrics = report.get("general_metrics", {})
@@ -394,8 +851,9 @@ class MonitoringManager:
                 })
             
             # Trigger alert callbacks
+            callbacks = self._alert_callbacks
             for alert in alerts:
-                for callback in self._alert_callbacks:
+                for callback in callbacks:
                     try:
                         callback(alert["type"], alert)
                     except Exception as e:
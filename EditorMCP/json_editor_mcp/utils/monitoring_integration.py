@@ -2,6 +2,7 @@
 
 import logging
 import atexit
+from types import SimpleNamespace
 from typing import Optional, Dict, Any
 
 from ..config.models import ServerConfig
@@ -96,6 +97,10 @@ class MonitoringIntegration:
                 self.monitoring_manager.stop_monitoring()
                 self.logger.info("Monitoring manager stopped")
             
+            # Release health check worker threads
+            if self.health_checker:
+                self.health_checker.close()
+            
             # Clear global references
             set_monitoring_manager(None)
             
@@ -110,9 +115,14 @@ class MonitoringIntegration:
             else:
                 print(f"ERROR during shutdown: {e}")
     
-    def get_status(self) -> Dict[str, Any]:
+    def get_status(self, snapshot: Optional[SimpleNamespace] = None) -> Dict[str, Any]:
         """Get current status of all monitoring components.
         
+        Args:
+            snapshot: Monitoring manager snapshot (see
+                MonitoringManager._collect_snapshot) to build the health
+                status from; collected by the manager when omitted
+        
         Returns:
             Dictionary containing status information
         """
@@ -133,7 +143,7 @@ class MonitoringIntegration:
             if self.monitoring_manager:
                 status["components"]["monitoring_manager"] = {
                     "active": self.monitoring_manager._monitoring_active,
-                    "health": self.monitoring_manager.get_health_status()
+                    "health": self.monitoring_manager.get_health_status(snapshot)
                 }
             
             # Health checker status
@@ -173,15 +183,18 @@ class MonitoringIntegration:
             }
         
         try:
+            # Collect once; the metrics report and system status share it
+            snapshot = self.monitoring_manager._collect_snapshot()
+            
             # Get main metrics report
-            report = self.monitoring_manager.get_metrics_report(include_history=True)
+            report = self.monitoring_manager.get_metrics_report(include_history=True, snapshot=snapshot)
             
             # Add health check results
             if self.health_checker:
                 report["health_check"] = self.health_checker.check_all_components()
             
             # Add system status
-            report["system_status"] = self.get_status()
+            report["system_status"] = self.get_status(snapshot)
             
             return report
             